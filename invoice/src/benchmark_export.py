@@ -0,0 +1,322 @@
+# benchmark_export.py
+# Benchmark dan regression check untuk InvoiceExporter.
+# Mengukur waktu, peak memory (tracemalloc + RSS) dan ukuran file output
+# untuk export_single_file, export_combined_file, apply_excel_formatting dan create_summary_sheet.
+# Setiap case dijalankan di proses terpisah agar peak RSS-nya tidak tercampur case lain.
+#
+# Contoh:
+#   python src/benchmark_export.py --sizes 10000 100000
+#   python src/benchmark_export.py --large               (tambah 1.000.000 baris, lama dan butuh beberapa GB)
+#   python src/benchmark_export.py --save-baseline      (simpan hasil sebagai baseline baru)
+
+import argparse
+import gc
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.utils.dataframe import dataframe_to_rows
+
+from export import InvoiceExporter
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+DEFAULT_SIZES = [10_000, 100_000]
+# Ukuran besar hanya dengan --large: butuh waktu lama dan beberapa GB memori
+LARGE_SIZE = 1_000_000
+CASES = ["export_single_file", "export_combined_file", "apply_excel_formatting", "create_summary_sheet"]
+BASELINE_FILE = os.path.join("benchmarks", "export_baseline.json")
+
+# Batas default per 10.000 baris, dipakai jika belum ada baseline.
+# Formatting dan combined export adalah jalur yang paling sering dioptimasi.
+DEFAULT_THRESHOLDS = {
+    "apply_excel_formatting": {"seconds_per_10k": 6.0, "peak_mb_per_10k": 60.0},
+    "export_combined_file": {"seconds_per_10k": 12.0, "peak_mb_per_10k": 120.0},
+}
+
+# Toleransi saat menyimpan baseline baru (mis. 0.25 = boleh 25% lebih lambat)
+BASELINE_TOLERANCE = 0.25
+
+
+def generate_invoice_frame(rows, seed=0):
+    """Membuat dataframe sintetis dengan kolom template invoice"""
+    rng = np.random.default_rng(seed)
+    po_numbers = np.array([f"PO{n:06d}" for n in range(max(rows // 50, 1))])
+    items = np.array([f"ITM-{n:05d}" for n in range(max(rows // 20, 1))])
+    metals = np.array(["AU375", "AU750", "AG925", "PT950"])
+
+    qty = rng.integers(1, 50, rows)
+    weight = np.round(rng.uniform(0.5, 80.0, rows), 2)
+    maklon = np.round(rng.uniform(1.0, 15.0, rows), 2)
+
+    return pd.DataFrame({
+        'PO#': po_numbers[rng.integers(0, len(po_numbers), rows)],
+        'Item': items[rng.integers(0, len(items), rows)],
+        'No.': np.arange(1, rows + 1),
+        'Metal': metals[rng.integers(0, len(metals), rows)],
+        "Q'ty": qty,
+        "Total w't": weight,
+        'maklon': maklon,
+        'total': np.round(weight * maklon, 2),
+    })
+
+
+def peak_rss_mb():
+    """Peak RSS proses (MB), None jika tidak tersedia di platform ini"""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux dalam KB, macOS dalam byte
+        return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+    if psutil is not None:
+        info = psutil.Process().memory_info()
+        return round(getattr(info, "peak_wset", info.rss) / (1024 * 1024), 1)
+    return None
+
+
+def measure(func, trace_memory=True, setup=None):
+    """Menjalankan func dan mengukur waktu serta peak memory.
+
+    Jika setup diberikan, hasilnya menjadi argumen func dan dibuat ulang sebelum
+    setiap pengukuran di luar bagian yang diukur. rss_delta_mb = kenaikan peak
+    RSS proses selama func berjalan.
+    """
+    args = () if setup is None else (setup(),)
+    gc.collect()
+    rss_before = peak_rss_mb()
+
+    # Waktu diukur tanpa tracemalloc karena tracemalloc memperlambat alokasi
+    start = time.perf_counter()
+    result = func(*args)
+    seconds = time.perf_counter() - start
+    rss_after = peak_rss_mb()
+
+    peak_mb = None
+    if trace_memory:
+        args = () if setup is None else (setup(),)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            func(*args)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        peak_mb = round(peak / (1024 * 1024), 1)
+
+    return result, {
+        "seconds": round(seconds, 3),
+        "tracemalloc_peak_mb": peak_mb,
+        "peak_rss_mb": rss_after,
+        "rss_delta_mb": None if rss_before is None else round(rss_after - rss_before, 1),
+    }
+
+
+def build_data_workbook(df):
+    """Workbook berisi data mentah (tanpa formatting) untuk benchmark formatting"""
+    workbook = Workbook()
+    worksheet = workbook.active
+    for row in dataframe_to_rows(df, index=False, header=True):
+        worksheet.append(row)
+    return workbook, worksheet
+
+
+def create_exporter(work_folder):
+    return InvoiceExporter(
+        template_folder=work_folder,
+        output_folder=os.path.join(work_folder, "output"),
+        deduplicate=False,
+    )
+
+
+def run_case(case, rows, work_folder, trace_memory=True, combined_files=4):
+    """Menjalankan satu case benchmark; dipanggil di proses anak oleh run_cases"""
+    exporter = create_exporter(work_folder)
+    # Log per-file export tidak relevan untuk benchmark
+    logging.getLogger().setLevel(logging.WARNING)
+    df = generate_invoice_frame(rows)
+    output = None
+
+    if case == "export_single_file":
+        single_path = os.path.join(work_folder, "processed_benchmark.xlsx")
+        output, stats = measure(
+            lambda: exporter.export_single_file(single_path, "xlsx", df=df), trace_memory
+        )
+
+    elif case == "export_combined_file":
+        # Data dibagi ke beberapa file sumber
+        bounds = np.linspace(0, rows, combined_files + 1, dtype=int)
+        frames = {
+            os.path.join(work_folder, f"processed_benchmark_{n}.xlsx"):
+                df.iloc[bounds[n]:bounds[n + 1]].reset_index(drop=True)
+            for n in range(combined_files)
+        }
+        # File sumber harus ada karena tanggal proses diambil dari mtime file
+        for file_path in frames:
+            open(file_path, 'a').close()
+        output, stats = measure(
+            lambda: exporter.export_combined_file(list(frames), "xlsx", frames=frames), trace_memory
+        )
+
+    elif case == "apply_excel_formatting":
+        # Workbook dibuat di luar pengukuran, hanya formatting yang diukur
+        _, stats = measure(
+            lambda workbook: exporter.apply_excel_formatting(*workbook), trace_memory,
+            setup=lambda: build_data_workbook(df),
+        )
+
+    else:
+        _, stats = measure(lambda: exporter.create_summary_sheet(Workbook(), df), trace_memory)
+
+    stats["file_size_mb"] = round(os.path.getsize(output) / (1024 * 1024), 2) if output else None
+    return {"case": case, "rows": rows, **stats}
+
+
+def run_cases(rows, work_folder, trace_memory=True):
+    """Menjalankan semua case benchmark untuk satu ukuran data, masing-masing di proses baru.
+
+    ru_maxrss adalah peak seumur proses, jadi tanpa proses terpisah semua case
+    setelah case terbesar akan melaporkan angka yang sama.
+    """
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for case in CASES:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            results.append(pool.submit(run_case, case, rows, work_folder, trace_memory).result())
+    return results
+
+
+def load_thresholds(baseline_file):
+    """Membaca threshold dari baseline, fallback ke DEFAULT_THRESHOLDS"""
+    if os.path.exists(baseline_file):
+        with open(baseline_file, 'r', encoding='utf-8') as f:
+            return json.load(f)["thresholds"]
+    return DEFAULT_THRESHOLDS
+
+
+def check_thresholds(results, thresholds):
+    """Mengembalikan daftar pelanggaran threshold"""
+    failures = []
+    for result in results:
+        limits = thresholds.get(result["case"])
+        if not limits:
+            continue
+
+        per_10k = result["rows"] / 10_000
+        seconds_per_10k = result["seconds"] / per_10k
+        if seconds_per_10k > limits["seconds_per_10k"]:
+            failures.append(
+                f"{result['case']} ({result['rows']} baris): {seconds_per_10k:.3f}s/10k "
+                f"> batas {limits['seconds_per_10k']:.3f}s/10k"
+            )
+
+        peak = result.get("tracemalloc_peak_mb")
+        if peak is not None and "peak_mb_per_10k" in limits:
+            peak_per_10k = peak / per_10k
+            if peak_per_10k > limits["peak_mb_per_10k"]:
+                failures.append(
+                    f"{result['case']} ({result['rows']} baris): {peak_per_10k:.1f}MB/10k "
+                    f"> batas {limits['peak_mb_per_10k']:.1f}MB/10k"
+                )
+    return failures
+
+
+def save_baseline(results, baseline_file):
+    """Menyimpan hasil (worst case per 10k baris + toleransi) sebagai baseline baru"""
+    thresholds = {}
+    for case in DEFAULT_THRESHOLDS:
+        case_results = [r for r in results if r["case"] == case]
+        if not case_results:
+            continue
+        seconds = max(r["seconds"] / (r["rows"] / 10_000) for r in case_results)
+        limits = {"seconds_per_10k": round(seconds * (1 + BASELINE_TOLERANCE), 4)}
+        peaks = [r["tracemalloc_peak_mb"] / (r["rows"] / 10_000)
+                 for r in case_results if r["tracemalloc_peak_mb"] is not None]
+        if peaks:
+            limits["peak_mb_per_10k"] = round(max(peaks) * (1 + BASELINE_TOLERANCE), 2)
+        thresholds[case] = limits
+
+    os.makedirs(os.path.dirname(baseline_file), exist_ok=True)
+    with open(baseline_file, 'w', encoding='utf-8') as f:
+        json.dump({
+            "created": datetime.now().isoformat(),
+            "tolerance": BASELINE_TOLERANCE,
+            "thresholds": thresholds,
+        }, f, indent=2)
+    print(f"Baseline disimpan ke: {baseline_file}")
+
+
+def print_results(results):
+    """Menampilkan hasil dalam bentuk tabel"""
+    table = pd.DataFrame(results)
+    table["rows_per_s"] = (table["rows"] / table["seconds"]).round(0)
+    print(table.to_string(index=False))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark InvoiceExporter")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Jumlah baris yang diuji")
+    parser.add_argument("--large", action="store_true",
+                        help=f"Tambahkan {LARGE_SIZE} baris (lama, butuh beberapa GB memori)")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="File baseline threshold")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Simpan hasil run ini sebagai baseline baru")
+    parser.add_argument("--no-tracemalloc", action="store_true",
+                        help="Lewati pengukuran tracemalloc (lebih cepat untuk data besar)")
+    parser.add_argument("--report", help="Simpan hasil ke file JSON")
+    args = parser.parse_args()
+
+    sizes = args.sizes + ([LARGE_SIZE] if args.large and LARGE_SIZE not in args.sizes else [])
+
+    work_folder = tempfile.mkdtemp(prefix="invoice_benchmark_")
+    results = []
+    try:
+        for rows in sizes:
+            print(f"Benchmark {rows} baris...")
+            results.extend(run_cases(rows, work_folder, not args.no_tracemalloc))
+    finally:
+        shutil.rmtree(work_folder, ignore_errors=True)
+
+    print()
+    print_results(results)
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nHasil disimpan ke: {args.report}")
+
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        return 0
+
+    failures = check_thresholds(results, load_thresholds(args.baseline))
+    if failures:
+        print("\nREGRESI TERDETEKSI:")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+
+    print("\nSemua case di bawah threshold.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -7,12 +7,35 @@ from datetime import datetime
 import openpyxl
 from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
 from openpyxl.utils.dataframe import dataframe_to_rows
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import logging
+from line_dedup import LineDeduplicator
+from invoice_columns import TEMPLATE_COLUMNS, compact_invoice_frame, concat_invoice_frames
+
+
+def _export_single_worker(template_folder, output_folder, processed_file, df, output_format):
+    """Worker untuk export satu file di process pool"""
+    exporter = InvoiceExporter(template_folder, output_folder)
+    return exporter.export_single_file(processed_file, output_format, df=df)
+
+
+def _export_combined_worker(template_folder, output_folder, processed_files, frames, output_format,
+                            deduplicate, dedup_file):
+    """Worker untuk export combined di process pool"""
+    exporter = InvoiceExporter(template_folder, output_folder,
+                               deduplicate=deduplicate, dedup_file=dedup_file)
+    return exporter.export_combined_file(processed_files, output_format, frames=frames)
+
 
 class InvoiceExporter:
-    def __init__(self, template_folder="template", output_folder="output"):
+    def __init__(self, template_folder="template", output_folder="output", max_workers=None,
+                 deduplicate=True, dedup_file="database/line_hashes.tsv"):
         self.template_folder = template_folder
         self.output_folder = output_folder
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        # Buang baris yang sudah pernah muncul di file lain saat export combined
+        self.deduplicate = deduplicate
+        self.dedup_file = dedup_file
         self.setup_logging()
         self.ensure_directories()
         
@@ -41,13 +64,77 @@ class InvoiceExporter:
         """Mencari file yang sudah diproses di folder template"""
         processed_files = []
         
-        # Cari file processed_*.xlsx
-        for file_path in Path(self.template_folder).glob("processed_*.xlsx"):
+        # Cari file processed_*.xlsx (urut nama agar hasil deduplikasi konsisten)
+        for file_path in sorted(Path(self.template_folder).glob("processed_*.xlsx")):
             processed_files.append(str(file_path))
         
         self.logger.info(f"Ditemukan {len(processed_files)} file yang sudah diproses")
         return processed_files
     
+    def load_processed_files(self, processed_files):
+        """Membaca setiap file processed satu kali, dipakai bersama oleh export individual dan combined"""
+        frames = {}
+        
+        for file_path in processed_files:
+            try:
+                frames[file_path] = compact_invoice_frame(pd.read_excel(file_path))
+            except Exception as e:
+                self.logger.error(f"Error reading {file_path}: {e}")
+        
+        return frames
+    
+    def export_individual_files(self, frames, output_format="xlsx", include_combined=False):
+        """Export setiap file secara paralel menggunakan process pool.
+        
+        Jika include_combined=True, export combined ikut dijalankan di pool yang sama
+        memakai dataframe yang sudah dibaca, sehingga tidak perlu membaca ulang file.
+        """
+        exported_files = []
+        processed_files = list(frames)
+        
+        if self.max_workers <= 1 or (len(frames) <= 1 and not include_combined):
+            for file_path, df in frames.items():
+                result = self.export_single_file(file_path, output_format, df=df)
+                if result:
+                    exported_files.append(result)
+            if include_combined:
+                result = self.export_combined_file(processed_files, output_format, frames=frames)
+                if result:
+                    exported_files.append(result)
+            return exported_files
+        
+        self.logger.info(f"Export {len(frames)} file dengan {self.max_workers} worker")
+        
+        with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {}
+            
+            # Combined biasanya paling lama, jadi dijadwalkan lebih dulu
+            if include_combined:
+                future = pool.submit(_export_combined_worker, self.template_folder, self.output_folder,
+                                     processed_files, frames, output_format,
+                                     self.deduplicate, self.dedup_file)
+                futures[future] = None
+            
+            for file_path, df in frames.items():
+                future = pool.submit(_export_single_worker, self.template_folder, self.output_folder,
+                                     file_path, df, output_format)
+                futures[future] = file_path
+            
+            results = {}
+            for future in as_completed(futures):
+                file_path = futures[future]
+                try:
+                    results[file_path] = future.result()
+                except Exception as e:
+                    self.logger.error(f"Error exporting {file_path or 'combined file'}: {e}")
+        
+        # Pertahankan urutan file seperti hasil find_processed_files, combined di akhir
+        for file_path in processed_files + ([None] if include_combined else []):
+            if results.get(file_path):
+                exported_files.append(results[file_path])
+        
+        return exported_files
+    
     def apply_excel_formatting(self, workbook, worksheet):
         """Menerapkan formatting pada Excel"""
         try:
@@ -149,13 +236,14 @@ class InvoiceExporter:
         except Exception as e:
             self.logger.error(f"Error creating summary sheet: {e}")
     
-    def export_single_file(self, processed_file, output_format="xlsx"):
+    def export_single_file(self, processed_file, output_format="xlsx", df=None):
         """Export single processed file dengan formatting"""
         try:
             self.logger.info(f"Exporting file: {processed_file}")
             
-            # Read processed data
-            df = pd.read_excel(processed_file)
+            # Read processed data (kecuali sudah dibaca oleh pemanggil)
+            if df is None:
+                df = compact_invoice_frame(pd.read_excel(processed_file))
             
             if df.empty:
                 self.logger.warning(f"File {processed_file} kosong")
@@ -194,28 +282,47 @@ class InvoiceExporter:
             self.logger.error(f"Error exporting {processed_file}: {e}")
             return None
     
-    def export_combined_file(self, processed_files, output_format="xlsx"):
+    def export_combined_file(self, processed_files, output_format="xlsx", frames=None):
         """Menggabungkan semua file dan export sebagai satu file"""
         try:
             self.logger.info("Creating combined export file")
             
             all_data = []
             file_info = []
+            deduplicator = LineDeduplicator(self.dedup_file) if self.deduplicate else None
             
             for file_path in processed_files:
                 try:
-                    df = pd.read_excel(file_path)
+                    if frames is not None:
+                        if file_path not in frames:
+                            continue
+                        # Salin agar kolom Source_File tidak ikut masuk ke dataframe milik pemanggil
+                        df = frames[file_path].copy(deep=False)
+                    else:
+                        df = compact_invoice_frame(pd.read_excel(file_path))
                     if not df.empty:
-                        # Add source file column
-                        df['Source_File'] = Path(file_path).stem
-                        all_data.append(df)
-                        file_info.append({
+                        source_file = Path(file_path).stem
+                        info = {
                             'file': Path(file_path).name,
                             'rows': len(df),
                             'processed_date': datetime.fromtimestamp(
                                 os.path.getmtime(file_path)
                             ).strftime('%Y-%m-%d %H:%M:%S')
-                        })
+                        }
+                        
+                        # Buang baris duplikat dari file lain
+                        if deduplicator is not None:
+                            df, dropped, duplicate_of = deduplicator.filter(df, source_file)
+                            info['rows'] = len(df)
+                            info['duplicates_dropped'] = dropped
+                            info['duplicate_of'] = ", ".join(duplicate_of)
+                        
+                        file_info.append(info)
+                        
+                        if not df.empty:
+                            # Add source file column
+                            df['Source_File'] = source_file
+                            all_data.append(df)
                 except Exception as e:
                     self.logger.error(f"Error reading {file_path}: {e}")
             
@@ -223,8 +330,8 @@ class InvoiceExporter:
                 self.logger.warning("Tidak ada data untuk digabungkan")
                 return None
             
-            # Combine all data
-            combined_df = pd.concat(all_data, ignore_index=True)
+            # Combine all data (kolom categorical tetap categorical)
+            combined_df = concat_invoice_frames(all_data)
             
             # Create output filename
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -254,6 +361,12 @@ class InvoiceExporter:
                 output_path = output_path.replace('.xlsx', '.csv')
                 combined_df.to_csv(output_path, index=False, encoding='utf-8-sig')
             
+            if deduplicator is not None:
+                deduplicator.save()
+                total_dropped = sum(info.get('duplicates_dropped', 0) for info in file_info)
+                if total_dropped:
+                    self.logger.info(f"Baris duplikat dibuang: {total_dropped}")
+            
             self.logger.info(f"Combined file exported to: {output_path}")
             self.logger.info(f"Total records: {len(combined_df)}")
             
@@ -277,11 +390,9 @@ class InvoiceExporter:
         exported_files = []
         
         if export_type == "individual":
-            # Export each file individually
-            for file_path in processed_files:
-                result = self.export_single_file(file_path, output_format)
-                if result:
-                    exported_files.append(result)
+            # Export each file individually (paralel)
+            frames = self.load_processed_files(processed_files)
+            exported_files.extend(self.export_individual_files(frames, output_format))
         
         elif export_type == "combined":
             # Export as single combined file
@@ -290,16 +401,13 @@ class InvoiceExporter:
                 exported_files.append(result)
         
         else:  # both
-            # Export individually
-            for file_path in processed_files:
-                result = self.export_single_file(file_path, output_format)
-                if result:
-                    exported_files.append(result)
+            # Baca setiap file sekali, lalu pakai untuk individual dan combined
+            frames = self.load_processed_files(processed_files)
             
-            # Export combined
-            result = self.export_combined_file(processed_files, output_format)
-            if result:
-                exported_files.append(result)
+            # Export individually dan combined sekaligus di worker pool
+            exported_files.extend(
+                self.export_individual_files(frames, output_format, include_combined=True)
+            )
         
         # Summary
         self.logger.info("=== RINGKASAN EXPORT ===")
@@ -317,11 +425,8 @@ class InvoiceExporter:
         """Membuat file template kosong"""
         template_path = os.path.join(self.template_folder, "template.xlsx")
         
-        # Template columns
-        columns = ['PO#', 'Item', 'No.', 'Metal', "Q'ty", "Total w't", 'maklon', 'total']
-        
         # Create empty dataframe with template columns
-        template_df = pd.DataFrame(columns=columns)
+        template_df = pd.DataFrame(columns=TEMPLATE_COLUMNS)
         
         try:
             with pd.ExcelWriter(template_path, engine='openpyxl') as writer:
@@ -0,0 +1,77 @@
+# invoice_columns.py
+# Representasi kolom invoice yang hemat memori.
+# Kolom berulang (PO#, Item, Metal, Source_File) disimpan sebagai categorical
+# dan kolom angka yang tersimpan sebagai teks dikonversi ke tipe numerik.
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+TEMPLATE_COLUMNS = ['PO#', 'Item', 'No.', 'Metal', "Q'ty", "Total w't", 'maklon', 'total']
+
+# Kolom dengan kardinalitas rendah: satu salinan string per nilai unik
+CATEGORY_COLUMNS = ['PO#', 'Item', 'Metal', 'Source_File']
+
+# Kolom yang isinya angka tapi sering terbaca sebagai teks.
+# 'No.' sengaja tidak termasuk: nomor itu identitas ('001' harus tetap '001')
+NUMERIC_COLUMNS = ["Q'ty", "Total w't", 'maklon', 'total']
+
+
+def to_numeric_if_possible(series):
+    """Konversi kolom teks ke numerik jika semua nilai yang tidak kosong adalah angka"""
+    if pd.api.types.is_numeric_dtype(series):
+        return series
+
+    text = series.astype(str).str.strip()
+    empty = series.isna() | (text == '') | (text.str.lower() == 'nan')
+    numeric = pd.to_numeric(text.where(~empty), errors='coerce')
+
+    # Ada nilai non-angka, biarkan sebagai teks
+    if numeric[~empty].isna().any():
+        return series
+
+    # Float tidak di-downcast ke float32 agar nilai berat/total tidak berubah di Excel
+    if not numeric.isna().any() and (numeric % 1 == 0).all():
+        return pd.to_numeric(numeric, downcast='integer')
+    return numeric
+
+
+def to_category(series):
+    """Konversi kolom ke categorical dengan kategori bertipe string"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series
+    as_text = series.where(series.isna(), series.astype(str).str.strip())
+    as_text = as_text.where(as_text != '')
+    return as_text.astype('category')
+
+
+def compact_invoice_frame(df):
+    """Mengubah dataframe invoice ke representasi categorical/numerik"""
+    df = df.copy(deep=False)
+    for column in NUMERIC_COLUMNS:
+        if column in df.columns:
+            df[column] = to_numeric_if_possible(df[column])
+    for column in CATEGORY_COLUMNS:
+        if column in df.columns:
+            df[column] = to_category(df[column])
+    return df
+
+
+def concat_invoice_frames(frames):
+    """Menggabungkan dataframe invoice tanpa kehilangan tipe categorical.
+
+    pd.concat mengubah categorical menjadi object jika kategorinya berbeda,
+    jadi kategori disatukan dulu dengan union_categoricals.
+    """
+    frames = [compact_invoice_frame(df) for df in frames]
+
+    for column in CATEGORY_COLUMNS:
+        present = [df[column] for df in frames if column in df.columns]
+        if not present:
+            continue
+        categories = union_categoricals(present, ignore_order=True).categories
+        dtype = pd.CategoricalDtype(categories)
+        for df in frames:
+            if column in df.columns:
+                df[column] = df[column].astype(dtype)
+
+    return pd.concat(frames, ignore_index=True)
\ No newline at end of file
@@ -3,11 +3,14 @@ import pandas as pd
 import re
 from pathlib import Path
 from import_data import InvoiceImporter
+from invoice_columns import TEMPLATE_COLUMNS, compact_invoice_frame
 
 class InvoiceProcessor:
-    def __init__(self, template_path="template/template.xls"):
+    def __init__(self, template_path="template/template.xls", store=None):
         self.importer = InvoiceImporter()
         self.template_path = template_path
+        # Opsional: InvoiceStore untuk memuat hasil proses ke database SQLite
+        self.store = store
 
     def process_single_file(self, file_path):
         df = self.importer.read_specific_file(file_path)
@@ -59,12 +62,18 @@ class InvoiceProcessor:
         df_data.columns = df_clean.iloc[header_row]
 
         # Hanya ambil kolom berikut
-        expected_columns = ['PO#', 'Item', 'No.', 'Metal', "Q'ty", "Total w't", 'maklon', 'total']
-        df_final = df_data[[col for col in expected_columns if col in df_data.columns]]
+        df_final = df_data[[col for col in TEMPLATE_COLUMNS if col in df_data.columns]]
+
+        # Angka disimpan sebagai angka, kolom berulang sebagai categorical
+        df_final = compact_invoice_frame(df_final)
 
         # Simpan ke template
         output_path = Path("template") / f"processed_{Path(file_path).stem}.xlsx"
         df_final.to_excel(output_path, index=False)
+
+        if self.store is not None:
+            self.store.load_dataframe(df_final, Path(file_path).stem, file_path=file_path)
+
         return str(output_path)
 
     def process_all_files(self):
@@ -0,0 +1,251 @@
+# invoice_store.py
+# Menyimpan baris invoice hasil proses ke database SQLite lokal
+# agar pencarian per PO#, Item, Metal, dll. tidak perlu membuka file xlsx satu per satu
+
+import argparse
+import logging
+import os
+import re
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+# Kolom template -> kolom tabel
+COLUMN_MAP = {
+    'PO#': 'po',
+    'Item': 'item',
+    'No.': 'no',
+    'Metal': 'metal',
+    "Q'ty": 'qty',
+    "Total w't": 'total_wt',
+    'maklon': 'maklon',
+    'total': 'total',
+}
+
+NUMERIC_COLUMNS = ['qty', 'total_wt', 'maklon', 'total']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS invoice_lines (
+    id INTEGER PRIMARY KEY,
+    source_file TEXT NOT NULL,
+    invoice_date TEXT,
+    po TEXT,
+    item TEXT,
+    no TEXT,
+    metal TEXT,
+    qty REAL,
+    total_wt REAL,
+    maklon REAL,
+    total REAL,
+    loaded_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_invoice_lines_po ON invoice_lines (po);
+CREATE INDEX IF NOT EXISTS idx_invoice_lines_item ON invoice_lines (item);
+CREATE INDEX IF NOT EXISTS idx_invoice_lines_metal ON invoice_lines (metal);
+CREATE INDEX IF NOT EXISTS idx_invoice_lines_source_file ON invoice_lines (source_file);
+CREATE INDEX IF NOT EXISTS idx_invoice_lines_invoice_date ON invoice_lines (invoice_date);
+"""
+
+# Nama file clearance berisi tanggal YYMMDD, misal "IJM250620 Clearance"
+DATE_PATTERN = re.compile(r"(\d{2})(\d{2})(\d{2})")
+
+
+class InvoiceStore:
+    def __init__(self, db_path="database/invoice_lines.db", batch_size=1000):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.logger = logging.getLogger(__name__)
+        self.ensure_database()
+
+    def connect(self):
+        """Membuka koneksi ke database"""
+        return sqlite3.connect(self.db_path)
+
+    def ensure_database(self):
+        """Membuat database, tabel dan index jika belum ada"""
+        db_folder = os.path.dirname(self.db_path)
+        if db_folder:
+            os.makedirs(db_folder, exist_ok=True)
+
+        with self.connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def parse_invoice_date(self, source_file, fallback_path=None):
+        """Mengambil tanggal invoice dari nama file, fallback ke tanggal modifikasi file"""
+        match = DATE_PATTERN.search(source_file)
+        if match:
+            try:
+                return datetime.strptime("".join(match.groups()), "%y%m%d").strftime("%Y-%m-%d")
+            except ValueError:
+                pass
+
+        if fallback_path and os.path.exists(fallback_path):
+            return datetime.fromtimestamp(os.path.getmtime(fallback_path)).strftime("%Y-%m-%d")
+
+        return None
+
+    def build_rows(self, df, source_file, invoice_date):
+        """Mengubah dataframe menjadi list tuple untuk executemany"""
+        data = pd.DataFrame(index=df.index)
+
+        for column, field in COLUMN_MAP.items():
+            if column in df.columns:
+                values = df[column]
+            else:
+                values = pd.Series(None, index=df.index, dtype=object)
+
+            if field in NUMERIC_COLUMNS:
+                values = pd.to_numeric(
+                    values.astype(str).str.replace(',', '', regex=False).str.strip(),
+                    errors='coerce'
+                )
+            else:
+                # Cek pd.isna di dalam map: dengan dtype string pandas, None dari
+                # where() kembali menjadi NaN dan tersimpan sebagai teks 'nan'
+                values = values.astype(object).map(
+                    lambda v: None if pd.isna(v) or not str(v).strip() else str(v).strip()
+                )
+            data[field] = values
+
+        # NaN -> NULL
+        data = data.astype(object).where(data.notna(), None)
+
+        loaded_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        fields = list(COLUMN_MAP.values())
+        return [
+            (source_file, invoice_date, *values, loaded_at)
+            for values in data[fields].itertuples(index=False, name=None)
+        ]
+
+    def load_dataframe(self, df, source_file, invoice_date=None, file_path=None):
+        """Memuat baris satu file ke database dalam satu transaksi.
+
+        Baris lama dari source_file yang sama dihapus lebih dulu sehingga
+        memuat ulang file yang sama tidak menggandakan data.
+        """
+        if invoice_date is None:
+            invoice_date = self.parse_invoice_date(source_file, file_path)
+
+        rows = self.build_rows(df, source_file, invoice_date)
+
+        insert_sql = (
+            "INSERT INTO invoice_lines "
+            "(source_file, invoice_date, po, item, no, metal, qty, total_wt, maklon, total, loaded_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+        )
+
+        conn = self.connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM invoice_lines WHERE source_file = ?", (source_file,))
+                for start in range(0, len(rows), self.batch_size):
+                    conn.executemany(insert_sql, rows[start:start + self.batch_size])
+        finally:
+            conn.close()
+
+        self.logger.info(f"Database: {len(rows)} baris dimuat dari {source_file}")
+        return len(rows)
+
+    def load_processed_file(self, file_path, df=None):
+        """Memuat file processed_*.xlsx ke database"""
+        try:
+            if df is None:
+                df = pd.read_excel(file_path)
+            source_file = Path(file_path).stem
+            if source_file.startswith("processed_"):
+                source_file = source_file[len("processed_"):]
+            return self.load_dataframe(df, source_file, file_path=file_path)
+        except Exception as e:
+            self.logger.error(f"Error loading {file_path} ke database: {e}")
+            return None
+
+    def load_processed_folder(self, template_folder="template"):
+        """Memuat semua file processed_*.xlsx di folder template"""
+        total = 0
+        for file_path in sorted(Path(template_folder).glob("processed_*.xlsx")):
+            loaded = self.load_processed_file(str(file_path))
+            if loaded:
+                total += loaded
+        self.logger.info(f"Database: total {total} baris dimuat ke {self.db_path}")
+        return total
+
+    def query(self, po=None, item=None, metal=None, source_file=None,
+              date_from=None, date_to=None, limit=None):
+        """Mencari baris invoice berdasarkan filter (semua filter memakai index)"""
+        conditions = []
+        params = []
+
+        for field, value in (('po', po), ('item', item), ('metal', metal), ('source_file', source_file)):
+            if value:
+                conditions.append(f"{field} = ?")
+                params.append(value)
+
+        if date_from:
+            conditions.append("invoice_date >= ?")
+            params.append(date_from)
+        if date_to:
+            conditions.append("invoice_date <= ?")
+            params.append(date_to)
+
+        sql = (
+            "SELECT source_file, invoice_date, po, item, no, metal, qty, total_wt, maklon, total "
+            "FROM invoice_lines"
+        )
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY invoice_date, source_file, id"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+
+        conn = self.connect()
+        try:
+            return pd.read_sql_query(sql, conn, params=params)
+        finally:
+            conn.close()
+
+
+def main():
+    """CLI sederhana untuk mencari baris invoice di database"""
+    parser = argparse.ArgumentParser(description="Cari baris invoice di database lokal")
+    parser.add_argument("--db", default="database/invoice_lines.db", help="Lokasi file database")
+    parser.add_argument("--po", help="Filter PO#")
+    parser.add_argument("--item", help="Filter Item")
+    parser.add_argument("--metal", help="Filter Metal")
+    parser.add_argument("--source", help="Filter nama file sumber")
+    parser.add_argument("--from", dest="date_from", help="Tanggal invoice awal (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="date_to", help="Tanggal invoice akhir (YYYY-MM-DD)")
+    parser.add_argument("--limit", type=int, help="Jumlah baris maksimum")
+    parser.add_argument("--load", metavar="FOLDER", help="Muat semua processed_*.xlsx dari folder ini dulu")
+    parser.add_argument("--csv", help="Simpan hasil ke file CSV")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    store = InvoiceStore(args.db)
+
+    if args.load:
+        store.load_processed_folder(args.load)
+
+    start = datetime.now()
+    result = store.query(
+        po=args.po, item=args.item, metal=args.metal, source_file=args.source,
+        date_from=args.date_from, date_to=args.date_to, limit=args.limit
+    )
+    elapsed_ms = (datetime.now() - start).total_seconds() * 1000
+
+    if args.csv:
+        result.to_csv(args.csv, index=False, encoding='utf-8-sig')
+        print(f"Hasil disimpan ke: {args.csv}")
+    elif result.empty:
+        print("Tidak ada baris yang cocok")
+    else:
+        print(result.to_string(index=False))
+
+    print(f"\n{len(result)} baris ditemukan dalam {elapsed_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,108 @@
+# line_dedup.py
+# Deduplikasi baris invoice lintas file dan lintas run.
+# Supplier kadang mengirim ulang invoice clearance yang sama dengan nama file berbeda,
+# sehingga baris yang sama masuk dua kali ke export combined.
+
+import hashlib
+import logging
+import os
+
+import pandas as pd
+
+# Kolom yang menentukan identitas satu baris invoice
+HASH_COLUMNS = ['PO#', 'Item', 'No.', 'Metal', "Q'ty", "Total w't"]
+
+
+def normalize_value(value):
+    """Normalisasi nilai sel agar 1, 1.0 dan '1' menghasilkan hash yang sama"""
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return ""
+    text = str(value).strip()
+    if text.lower() == "nan":
+        return ""
+    try:
+        return repr(round(float(text.replace(',', '')), 6))
+    except ValueError:
+        return text
+
+
+class LineDeduplicator:
+    """Menyimpan hash setiap baris beserta file sumber pertama yang memuatnya.
+
+    Baris dianggap duplikat jika hash-nya sudah pernah terlihat di file sumber lain.
+    Export ulang file yang sama tidak dianggap duplikat.
+    """
+
+    def __init__(self, state_file="database/line_hashes.tsv"):
+        self.state_file = state_file
+        self.logger = logging.getLogger(__name__)
+        self.seen = {}
+        self.pending = []
+        self.load()
+
+    def load(self):
+        """Membaca hash yang sudah tersimpan dari run sebelumnya"""
+        self.seen = {}
+        if not os.path.exists(self.state_file):
+            return
+
+        with open(self.state_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                line_hash, _, source_file = line.rstrip('\n').partition('\t')
+                if line_hash:
+                    self.seen.setdefault(line_hash, source_file)
+
+        self.logger.info(f"Dedup: {len(self.seen)} hash baris dimuat dari {self.state_file}")
+
+    def line_hashes(self, df):
+        """Menghitung hash stabil untuk setiap baris"""
+        parts = []
+        for column in HASH_COLUMNS:
+            if column in df.columns:
+                parts.append(df[column].map(normalize_value).astype(str))
+            else:
+                parts.append(pd.Series("", index=df.index))
+
+        keys = parts[0].str.cat(parts[1:], sep='\x1f')
+        return keys.map(lambda key: hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest())
+
+    def filter(self, df, source_file):
+        """Membuang baris yang sudah ada di file sumber lain.
+
+        Return (dataframe tanpa duplikat, jumlah baris dibuang, daftar file asal duplikat).
+        """
+        if df.empty:
+            return df, 0, []
+
+        hashes = self.line_hashes(df)
+        owners = hashes.map(self.seen.get)
+        duplicate_mask = owners.notna() & (owners != source_file)
+
+        for line_hash in hashes[owners.isna()].unique():
+            self.seen[line_hash] = source_file
+            self.pending.append((line_hash, source_file))
+
+        dropped = int(duplicate_mask.sum())
+        duplicate_of = sorted(owners[duplicate_mask].unique()) if dropped else []
+
+        if dropped:
+            self.logger.warning(
+                f"Dedup: {dropped} baris di {source_file} sudah ada di {', '.join(duplicate_of)}"
+            )
+
+        return df[~duplicate_mask], dropped, duplicate_of
+
+    def save(self):
+        """Menambahkan hash baru ke file state"""
+        if not self.pending:
+            return
+
+        state_folder = os.path.dirname(self.state_file)
+        if state_folder:
+            os.makedirs(state_folder, exist_ok=True)
+
+        with open(self.state_file, 'a', encoding='utf-8') as f:
+            f.writelines(f"{line_hash}\t{source_file}\n" for line_hash, source_file in self.pending)
+
+        self.logger.info(f"Dedup: {len(self.pending)} hash baru disimpan ke {self.state_file}")
+        self.pending = []
\ No newline at end of file
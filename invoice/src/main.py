@@ -7,6 +7,7 @@ try:
     from import_data import InvoiceImporter
     from export import InvoiceExporter
     from invoice_processor import InvoiceProcessor
+    from invoice_store import InvoiceStore
 except ImportError as e:
     print(f"Error importing modules: {e}")
     print("Pastikan semua file modul berada dalam direktori yang sama")
@@ -17,6 +18,7 @@ class InvoiceManager:
         self.processor = InvoiceProcessor()
         self.importer = InvoiceImporter()
         self.exporter = InvoiceExporter()
+        self.store = None
         
     def setup_directories(self):
         """Membuat direktori yang diperlukan jika belum ada"""
@@ -35,7 +37,8 @@ class InvoiceManager:
         print("3. Import Data from Master")
         print("4. Export Processed Data")
         print("5. Check Directory Status")
-        print("6. Exit")
+        print("6. Load Processed Data to Database")
+        print("7. Exit")
         print("="*50)
     
     def check_directory_status(self):
@@ -58,6 +61,15 @@ class InvoiceManager:
         output_files = list(Path('output').glob('*'))
         print(f"Output Directory: {len(output_files)} file(s)")
     
+    def load_to_database(self):
+        """Memuat semua file processed ke database SQLite"""
+        print("\n=== MEMUAT DATA KE DATABASE ===")
+        if self.store is None:
+            self.store = InvoiceStore()
+        total = self.store.load_processed_folder('template')
+        print(f"{total} baris dimuat ke {self.store.db_path}")
+        print("Gunakan 'python src/invoice_store.py --po <PO#>' untuk mencari data")
+    
     def process_all_files(self):
         """Memproses semua file secara otomatis"""
         print("\n=== MEMULAI PEMROSESAN OTOMATIS ===")
@@ -102,7 +114,7 @@ class InvoiceManager:
         while True:
             try:
                 self.show_menu()
-                choice = input("Pilih opsi (1-6): ").strip()
+                choice = input("Pilih opsi (1-7): ").strip()
                 
                 if choice == '1':
                     self.process_all_files()
@@ -117,10 +129,12 @@ class InvoiceManager:
                 elif choice == '5':
                     self.check_directory_status()
                 elif choice == '6':
+                    self.load_to_database()
+                elif choice == '7':
                     print("Terima kasih! Program selesai.")
                     break
                 else:
-                    print("Pilihan tidak valid. Pilih 1-6.")
+                    print("Pilihan tidak valid. Pilih 1-7.")
                     
                 input("\nTekan Enter untuk melanjutkan...")
                 
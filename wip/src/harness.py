@@ -0,0 +1,275 @@
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import secrets
+import shutil
+import tempfile
+import time
+from datetime import datetime
+
+from utils.stub_erp import FIXTURE_DIR, StubERP
+
+REPORT_NAMES = ["filling", "loss", "komponen"]
+FETCH_MODES = ["http", "async", "pool", "browser"]
+EXTRACT_MODES = ["lxml", "js", "elements"]
+BENCH_FOLDER = os.path.join("data", "bench")
+
+
+def add_server_args(parser):
+    parser.add_argument("--fixtures", default=FIXTURE_DIR, help=f"Folder fixture (default: {FIXTURE_DIR})")
+    parser.add_argument("--latency", type=float, default=0.05, help="Latensi per halaman (detik)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Tambahan latensi acak 0..JITTER detik")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Peluang HTTP 500 per halaman (0-1)")
+    parser.add_argument("--error-page-rate", type=float, default=0.0,
+                        help="Peluang halaman error (HTTP 200) per halaman (0-1)")
+    parser.add_argument("--synthetic-rows", type=int, default=50,
+                        help="Jumlah baris halaman sintetis untuk bagian tanpa fixture (0 = halaman error)")
+    parser.add_argument("--thead", action="store_true",
+                        help="Halaman sintetis memakai <thead> + <tbody> (uji parser streaming)")
+    parser.add_argument("--seed", type=int, help="Seed untuk latensi dan error acak")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Fixture anonim, server ERP lokal, dan benchmark scraping WIP"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="Rekam halaman ERP asli sebagai fixture anonim")
+    record.add_argument("--date", required=True, help="Tanggal laporan YYYY-MM-DD yang direkam")
+    record.add_argument("--reports", nargs="+", choices=REPORT_NAMES, default=REPORT_NAMES)
+    record.add_argument("--fixtures", default=FIXTURE_DIR, help=f"Folder fixture (default: {FIXTURE_DIR})")
+    record.add_argument("--salt", default=os.getenv("FIXTURE_SALT"),
+                        help="Salt anonimisasi (default: FIXTURE_SALT atau acak)")
+
+    serve = commands.add_parser("serve", help="Jalankan server ERP lokal dari fixture")
+    serve.add_argument("--port", type=int, default=8765)
+    add_server_args(serve)
+
+    bench = commands.add_parser("bench", help="Ukur halaman/detik dan baris/detik per mode")
+    bench.add_argument("--modes", nargs="+", choices=FETCH_MODES + EXTRACT_MODES,
+                       default=["http", "async", "lxml"])
+    bench.add_argument("--reports", nargs="+", choices=REPORT_NAMES, default=REPORT_NAMES)
+    bench.add_argument("--rounds", type=int, default=3, help="Jumlah putaran per mode")
+    bench.add_argument("--retries", type=int, default=0, help="Retry bagian gagal selama benchmark")
+    add_server_args(bench)
+    return parser.parse_args(argv)
+
+
+def stub_from_args(args):
+    return StubERP(
+        folder=args.fixtures,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_page_rate=args.error_page_rate,
+        synthetic_rows=args.synthetic_rows,
+        thead=args.thead,
+        seed=args.seed,
+    )
+
+
+def record(args):
+    """Login ke ERP asli (.env) lalu simpan halaman laporan sebagai fixture anonim"""
+    from utils.common import build_urls, create_http_session
+    from utils.fixtures import record_fixtures
+    from utils.reports import get_report
+
+    salt = args.salt or secrets.token_hex(16)
+    specs = {name: get_report(name) for name in args.reports}
+    session = create_http_session()
+    index = record_fixtures(session, specs, args.date, build_urls, salt, args.fixtures)
+    print(f"✅ {len(index['fixtures'])} fixture tersimpan di {args.fixtures}")
+
+
+def temp_session_file():
+    """SESSION_FILE sementara agar cookie server lokal tidak menimpa cookie ERP asli"""
+    return os.path.join(tempfile.mkdtemp(prefix="wip-stub-session-"), "cookies.json")
+
+
+def serve(args):
+    erp = stub_from_args(args)
+    session_file = temp_session_file()
+    print(f"🧪 Server ERP lokal: http://127.0.0.1:{args.port} (fixture: {args.fixtures})")
+    print(f"🔐 Login: EMAIL={erp.email} PASSWORD={erp.password}")
+    print(f"💡 Jalankan runner dengan WEB_URL=http://127.0.0.1:{args.port} SESSION_FILE={session_file}")
+    try:
+        erp.serve(port=args.port)
+    except KeyboardInterrupt:
+        print("\n🛑 Server dihentikan.")
+    finally:
+        shutil.rmtree(os.path.dirname(session_file), ignore_errors=True)
+
+
+def result_row(mode, pages, rows, seconds, **extra):
+    return {
+        "mode": mode,
+        "pages": pages,
+        "rows": rows,
+        "seconds": round(seconds, 4),
+        "pages_per_s": round(pages / seconds, 2) if seconds else 0.0,
+        "rows_per_s": round(rows / seconds, 1) if seconds else 0.0,
+        **extra,
+    }
+
+
+def bench_fetch(mode, specs, tanggal, rounds, retries):
+    """Mengukur satu mode fetch lewat fetch_report; login diukur terpisah"""
+    from runner import connect, disconnect, fetch_report, open_session
+
+    context = open_session(mode, retries=retries)
+    pages = rows = gaps = 0
+    try:
+        start = time.perf_counter()
+        connect(context)
+        login_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for spec in specs.values():
+                data, missing = fetch_report(context, spec, tanggal)
+                pages += len(spec["bagian"])
+                rows += len(data)
+                gaps += len(missing)
+        seconds = time.perf_counter() - start
+    finally:
+        disconnect(context)
+    return result_row(mode, pages, rows, seconds, login_s=round(login_s, 4), gaps=gaps)
+
+
+def report_pages(erp, specs, tanggal):
+    """Halaman yang dilayani server untuk setiap bagian: [(url path, id bagian, isi)]"""
+    pages = []
+    for spec in specs.values():
+        for bagian_id in spec["bagian"].values():
+            path = "/" + spec["base_path"]
+            content = erp.report_page(path, str(bagian_id), tanggal)
+            if content is not None:
+                pages.append((path, str(bagian_id), content))
+    return pages
+
+
+def bench_lxml(erp, specs, tanggal, rounds):
+    """Parsing lxml saja (tanpa jaringan) untuk halaman yang sama dengan server"""
+    from utils.http_fetch import parse_report_page
+
+    pages = report_pages(erp, specs, tanggal)
+    rows = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for _, _, content in pages:
+            rows += len(parse_report_page(content) or [])
+    seconds = time.perf_counter() - start
+    return result_row("lxml", len(pages) * rounds, rows, seconds)
+
+
+def bench_browser_extract(modes, erp, base_url, specs, tanggal, rounds):
+    """Ekstraksi di browser: satu execute_script (js) vs per elemen (elements).
+
+    Halaman dimuat sekali per putaran; yang diukur hanya waktu ekstraksinya.
+    """
+    from utils.common import create_driver, extract_table_data_elements, login
+    from utils.driver_profile import shutdown_driver
+    from utils.js_extract import extract_table_rows
+    from utils.waits import wait_for_table
+
+    pages = report_pages(erp, specs, tanggal)
+    totals = {mode: [0, 0.0] for mode in modes}
+    driver = create_driver()
+    try:
+        login(driver)
+        for _ in range(rounds):
+            for path, bagian_id, _ in pages:
+                driver.get(f"{base_url}{path}?d={tanggal}&s=&b={bagian_id}&m=all")
+                wait_for_table(driver)
+                for mode in modes:
+                    start = time.perf_counter()
+                    if mode == "js":
+                        _, extracted = extract_table_rows(driver)
+                        extracted = (extracted or [])[1:-1]
+                    else:
+                        extracted = extract_table_data_elements(driver)
+                    totals[mode][0] += len(extracted)
+                    totals[mode][1] += time.perf_counter() - start
+    finally:
+        shutdown_driver(driver)
+    return [result_row(mode, len(pages) * rounds, rows, seconds)
+            for mode, (rows, seconds) in totals.items()]
+
+
+def print_results(results):
+    print(f"\n{'mode':<10} {'halaman':>8} {'baris':>9} {'detik':>8} {'halaman/s':>10} {'baris/s':>10}")
+    for r in results:
+        if "skipped" in r:
+            print(f"{r['mode']:<10} dilewati: {r['skipped']}")
+            continue
+        extra = f"  (login {r['login_s']:.2f} detik, {r['gaps']} gap)" if "login_s" in r else ""
+        print(f"{r['mode']:<10} {r['pages']:>8} {r['rows']:>9} {r['seconds']:>8.2f} "
+              f"{r['pages_per_s']:>10.1f} {r['rows_per_s']:>10.1f}{extra}")
+
+
+def bench(args):
+    """Menjalankan server lokal lalu mengukur setiap mode terhadapnya"""
+    erp = stub_from_args(args)
+    server, base_url = erp.start()
+    # Modul scraper membaca WEB_URL/EMAIL/PASSWORD saat di-import, jadi env diisi lebih dulu.
+    # Cookie login disimpan di folder sementara agar data/session milik ERP asli tidak tertimpa.
+    session_file = temp_session_file()
+    os.environ.update(WEB_URL=base_url, EMAIL=erp.email, PASSWORD=erp.password, HTTP_LOGIN="form",
+                      SESSION_FILE=session_file)
+    from utils.logs import logger
+    from utils.reports import get_report
+
+    logger.setLevel(logging.ERROR)
+    specs = {name: get_report(name) for name in args.reports}
+    tanggal = datetime.today().strftime("%Y-%m-%d")
+    print(f"🧪 Benchmark terhadap {base_url} (latensi {args.latency:g} detik, "
+          f"jitter {args.jitter:g}, error {args.error_rate:g}/{args.error_page_rate:g}), "
+          f"{args.rounds} putaran")
+
+    results = []
+    for mode in [m for m in args.modes if m in FETCH_MODES + ["lxml"]]:
+        print(f"⏱️ {mode}...")
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                if mode == "lxml":
+                    results.append(bench_lxml(erp, specs, tanggal, args.rounds))
+                else:
+                    results.append(bench_fetch(mode, specs, tanggal, args.rounds, args.retries))
+        except Exception as e:
+            results.append({"mode": mode, "skipped": str(e).splitlines()[0] if str(e) else repr(e)})
+
+    browser_modes = [m for m in args.modes if m in ("js", "elements")]
+    if browser_modes:
+        print(f"⏱️ {', '.join(browser_modes)}...")
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                results += bench_browser_extract(browser_modes, erp, base_url, specs, tanggal,
+                                                 args.rounds)
+        except Exception as e:
+            reason = str(e).splitlines()[0] if str(e) else repr(e)
+            results += [{"mode": mode, "skipped": reason} for mode in browser_modes]
+    server.shutdown()
+    shutil.rmtree(os.path.dirname(session_file), ignore_errors=True)
+
+    print_results(results)
+    os.makedirs(BENCH_FOLDER, exist_ok=True)
+    filename = os.path.join(BENCH_FOLDER, f"bench-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump({"server": {k: getattr(args, k) for k in ("latency", "jitter", "error_rate",
+                                                             "error_page_rate", "synthetic_rows")},
+                   "requests": erp.counts, "results": results}, f, indent=2)
+    print(f"\n📈 Hasil: {filename}")
+    return results
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    {"record": record, "serve": serve, "bench": bench}[args.command](args)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
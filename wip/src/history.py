@@ -0,0 +1,44 @@
+import argparse
+
+from utils.history import HISTORY_DIR, read_history
+from utils.reports import REPORTS
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Membaca history laporan WIP dari dataset Parquet")
+    parser.add_argument("report", choices=list(REPORTS), help="Laporan yang dibaca")
+    parser.add_argument("--from", dest="date_from", help="Tanggal awal YYYY-MM-DD")
+    parser.add_argument("--to", dest="date_to", help="Tanggal akhir YYYY-MM-DD (inklusif)")
+    parser.add_argument("--columns", nargs="+", help="Kolom nilai yang dibaca, misalnya col_3 col_5")
+    parser.add_argument("--bagian", nargs="+", help="Hanya bagian tertentu")
+    parser.add_argument("--folder", default=HISTORY_DIR, help=f"Folder dataset (default: {HISTORY_DIR})")
+    parser.add_argument("--csv", help="Simpan hasil ke file CSV")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    spec = REPORTS[args.report]
+    df = read_history(
+        spec["prefix"],
+        args.date_from,
+        args.date_to,
+        columns=args.columns,
+        bagian=args.bagian,
+        folder=args.folder,
+    )
+
+    if df.empty:
+        print("❌ Tidak ada data history untuk filter tersebut")
+        return
+
+    print(f"📊 {len(df)} baris dari {df['date'].nunique()} tanggal")
+    if args.csv:
+        df.to_csv(args.csv, index=False)
+        print(f"✅ Disimpan ke {args.csv}")
+    else:
+        print(df.to_string(max_rows=20))
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
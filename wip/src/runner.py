@@ -0,0 +1,384 @@
+import argparse
+import os
+import traceback
+from functools import partial
+
+from utils.common import (
+    FETCH_MODE,
+    build_urls,
+    collect_data,
+    create_driver,
+    create_http_session,
+    get_tanggal_input,
+    login,
+)
+from utils.async_fetch import collect_data_async
+from utils.backfill import date_range, run_backfill
+from utils.browser_pool import BROWSER_POOL_SIZE, BrowserPool, collect_data_pool
+from utils.driver_profile import shutdown_driver
+from utils.excel import save_to_excel_with_number_format
+from utils.history import append_history
+from utils.http_fetch import HTTP_STREAM_PARSE, collect_data_http
+from utils.logs import logger, setup_logging
+from utils.page_cache import PageCache
+from utils.polling import POLL_MINUTES, PagePoller, poll_reports
+from utils.reports import REPORTS, get_report
+from utils.retry import RETRY_ATTEMPTS, CircuitBreaker, collect_with_retry
+from utils.sink import CsvSink, ListSink
+from utils.telemetry import Telemetry
+from utils.tab_pool import TAB_POOL_SIZE
+
+FETCH_MODES = ["browser", "pool", "http", "async"]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Scraping laporan WIP (filling, loss, komponen) dengan satu login"
+    )
+    parser.add_argument(
+        "--reports",
+        nargs="+",
+        choices=list(REPORTS),
+        default=list(REPORTS),
+        help="Laporan yang diambil (default: semua)",
+    )
+    parser.add_argument(
+        "--date",
+        dest="dates",
+        nargs="+",
+        help="Tanggal YYYY-MM-DD, boleh lebih dari satu (default: ditanyakan sekali)",
+    )
+    parser.add_argument(
+        "--from",
+        dest="date_from",
+        help="Backfill: tanggal awal YYYY-MM-DD (dipakai bersama --to)",
+    )
+    parser.add_argument(
+        "--to",
+        dest="date_to",
+        help="Backfill: tanggal akhir YYYY-MM-DD (inklusif)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=TAB_POOL_SIZE,
+        help="Backfill: jumlah worker (tab browser atau thread HTTP)",
+    )
+    parser.add_argument(
+        "--poll",
+        nargs="?",
+        type=float,
+        const=POLL_MINUTES,
+        metavar="MENIT",
+        help=f"Polling laporan hari ini setiap MENIT menit (default {POLL_MINUTES:g}), "
+             "hanya baris baru/berubah yang ditulis ke data/live",
+    )
+    parser.add_argument(
+        "--poll-cycles",
+        type=int,
+        help="Polling: berhenti setelah sejumlah putaran (default: sampai Ctrl+C)",
+    )
+    parser.add_argument(
+        "--mode",
+        choices=FETCH_MODES,
+        default=FETCH_MODE if FETCH_MODE in FETCH_MODES else "browser",
+        help="Cara mengambil halaman (default: FETCH_MODE di .env)",
+    )
+    parser.add_argument(
+        "--browsers",
+        type=int,
+        default=BROWSER_POOL_SIZE,
+        help="Mode pool: jumlah browser headless yang login sendiri-sendiri",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=RETRY_ATTEMPTS,
+        help=f"Jumlah retry untuk bagian yang gagal (default {RETRY_ATTEMPTS})",
+    )
+    parser.add_argument(
+        "--no-cache",
+        dest="use_cache",
+        action="store_false",
+        help="Selalu mengambil halaman dari web, tanpa cache di data/cache",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Tulis baris ke data/{prefix}-{tanggal}.csv begitu setiap bagian selesai "
+             "(tanpa xlsx, laporan tidak ditahan di memori)",
+    )
+    parser.add_argument(
+        "--history",
+        action="store_true",
+        help="Simpan juga ke dataset Parquet di data/history (butuh pyarrow)",
+    )
+    parser.add_argument(
+        "--debug",
+        action="store_true",
+        help="Browser terlihat, highlight baris, log level DEBUG (termasuk isi setiap baris), "
+             "dan browser tetap terbuka di akhir",
+    )
+    args = parser.parse_args(argv)
+    if bool(args.date_from) != bool(args.date_to):
+        parser.error("--from dan --to harus dipakai bersama")
+    if args.date_from and args.dates:
+        parser.error("--date tidak bisa dipakai bersama --from/--to")
+    if args.poll is not None and (args.dates or args.date_from):
+        parser.error("--poll selalu memakai tanggal hari ini")
+    if args.stream and (args.history or args.date_from or args.poll is not None):
+        parser.error("--stream hanya untuk run biasa, tidak bisa dengan --history, --from/--to atau --poll")
+    return args
+
+
+def open_session(mode, debug=False, cache=None, browsers=BROWSER_POOL_SIZE,
+                 retries=RETRY_ATTEMPTS, stream=False):
+    """Konteks bersama untuk semua laporan dan tanggal; login dilakukan oleh connect"""
+    return {
+        "mode": mode,
+        "debug": debug,
+        "cache": cache,
+        "telemetry": Telemetry(mode),
+        "breaker": CircuitBreaker(),
+        "retries": retries,
+        # Mode http mem-parsing halaman per potongan jika output juga streaming
+        "stream_parse": stream or HTTP_STREAM_PARSE,
+        "browsers": browsers,
+        "driver": None,
+        "session": None,
+        "pool": None,
+    }
+
+
+def connect(context):
+    """Login sekali saat halaman pertama benar-benar perlu diambil dari web"""
+    if any(context[key] is not None for key in ("driver", "session", "pool")):
+        return
+    if context["mode"] == "pool":
+        context["pool"] = BrowserPool(context["browsers"], debug=context["debug"]).start()
+    elif context["mode"] == "browser":
+        context["driver"] = create_driver(debug=context["debug"])
+        login(context["driver"])
+    else:
+        context["session"] = create_http_session()
+
+
+def fetch_report(context, spec, tanggal, debug=False, sink=None):
+    """Mengambil semua bagian satu laporan untuk satu tanggal.
+
+    Baris ditulis ke sink sesuai urutan bagian; bagian yang gagal diulang dengan
+    backoff. Return (hasil sink.close(), {bagian: alasan}); tanpa sink hasilnya
+    list semua baris.
+    """
+    urls = build_urls(spec["base_path"], tanggal, spec["bagian"])
+    print(f"🔗 Generated {len(urls)} URLs")
+
+    cache = context["cache"]
+    telemetry = context["telemetry"]
+    if cache:
+        cached, missing = cache.split(urls)
+        if not missing:
+            print(f"💾 Semua {len(urls)} bagian diambil dari cache")
+            output = sink if sink is not None else ListSink()
+            for bagian in urls:
+                output.write(bagian, cached[bagian])
+                telemetry.record(spec["jenis"], bagian, urls[bagian], "cache",
+                                 rows=len(cached[bagian]))
+            return output.close(), {}
+
+    connect(context)
+
+    def collect(urls, failed, output):
+        if context["mode"] == "http":
+            return collect_data_http(context["session"], urls, spec["jenis"], cache=cache,
+                                     telemetry=telemetry, failed=failed, sink=output,
+                                     stream_parse=context["stream_parse"])
+        if context["mode"] == "async":
+            return collect_data_async(context["session"], urls, spec["jenis"], cache=cache,
+                                      telemetry=telemetry, failed=failed, sink=output)
+        if context["mode"] == "pool":
+            return collect_data_pool(context["pool"], urls, spec["jenis"], cache=cache,
+                                     telemetry=telemetry, failed=failed, sink=output)
+        return collect_data(context["driver"], urls, spec["jenis"], debug=debug, cache=cache,
+                            telemetry=telemetry, failed=failed, sink=output)
+
+    return collect_with_retry(collect, urls, context["breaker"], context["retries"], sink=sink)
+
+
+def save_report(spec, tanggal, data):
+    """Menyimpan hasil satu laporan ke data/{prefix}-{tanggal}.xlsx"""
+    if not data:
+        print("❌ Tidak ada data yang berhasil dikumpulkan!")
+        print("🔍 Kemungkinan penyebab:")
+        print("  - Selector CSS tidak cocok dengan struktur HTML")
+        print("  - Tanggal tidak memiliki data")
+        print("  - Halaman web berubah struktur")
+        print("  - Koneksi timeout")
+        return None
+
+    os.makedirs("data", exist_ok=True)
+    filename = f"data/{spec['prefix']}-{tanggal}.xlsx"
+
+    logger.debug("📋 Struktur data pertama: %s", data[0])
+    logger.debug("📏 Jumlah kolom: %d", len(data[0]))
+
+    manifest = save_to_excel_with_number_format(data, filename)
+    if manifest is None:
+        print(f"❌ File tidak berhasil dibuat: {filename}")
+        return None
+
+    print(f"✅ Data {spec['jenis']} berhasil disimpan di '{filename}'")
+    print(f"📁 Ukuran file: {manifest['size_bytes']} bytes, sha256 {manifest['sha256'][:12]}…")
+    print(f"✅ Manifest: {manifest['rows']} baris, {manifest['columns']} kolom, "
+          f"{len(manifest['bagian_rows'])} bagian")
+
+    logger.debug("\n🔍 Debug info - Sample data:")
+    for i, row in enumerate(data[:3]):
+        logger.debug("Baris %d: %s", i + 1, row)
+
+    return filename
+
+
+def stream_report(context, spec, tanggal, debug=False):
+    """Mengambil satu laporan langsung ke data/{prefix}-{tanggal}.csv.
+
+    Return (filename, jumlah baris, {bagian: alasan}).
+    """
+    filename = f"data/{spec['prefix']}-{tanggal}.csv"
+    sink = CsvSink(filename)
+    try:
+        manifest, gaps = fetch_report(context, spec, tanggal, debug, sink)
+    except BaseException:
+        sink.abort()
+        raise
+
+    if manifest is None:
+        print("❌ Tidak ada data yang berhasil dikumpulkan!")
+        return None, 0, gaps
+    print(f"✅ Data {spec['jenis']} berhasil disimpan di '{filename}'")
+    print(f"📁 Ukuran file: {manifest['size_bytes']} bytes, sha256 {manifest['sha256'][:12]}…")
+    print(f"✅ Manifest: {manifest['rows']} baris, {manifest['columns']} kolom, "
+          f"{len(manifest['bagian_rows'])} bagian")
+    return filename, manifest["rows"], gaps
+
+
+def disconnect(context):
+    """Menutup browser pool dan browser milik konteks"""
+    if context["pool"] is not None:
+        context["pool"].close()
+    shutdown_driver(context["driver"])
+
+
+def save_outputs(spec, tanggal, data, history=False):
+    """Menyimpan xlsx dan, jika diminta, partisi history Parquet"""
+    filename = save_report(spec, tanggal, data)
+    if history and data:
+        try:
+            append_history(spec["prefix"], tanggal, data)
+        except Exception as e:
+            print(f"⚠️ Gagal menyimpan history {spec['prefix']} {tanggal}: {e}")
+    return filename
+
+
+def run(report_names, dates, mode, debug=False, cache=None, browsers=BROWSER_POOL_SIZE,
+        history=False, retries=RETRY_ATTEMPTS, stream=False):
+    """Menjalankan laporan yang dipilih untuk setiap tanggal dengan satu sesi login"""
+    summary = []
+    context = open_session(mode, debug, cache, browsers, retries, stream)
+
+    try:
+        for tanggal in dates:
+            for name in report_names:
+                spec = get_report(name)
+                print(f"\n{'=' * 60}")
+                print(f"🚀 Memulai scraping data {spec['jenis']} - {tanggal}...")
+                try:
+                    if stream:
+                        filename, rows, gaps = stream_report(context, spec, tanggal, debug)
+                    else:
+                        data, gaps = fetch_report(context, spec, tanggal, debug)
+                        rows = len(data)
+                        print(f"\n📊 Data yang terkumpul: {rows} baris")
+                        filename = save_outputs(spec, tanggal, data, history)
+                except Exception as e:
+                    print(f"❌ Terjadi kesalahan pada {name} {tanggal}: {e}")
+                    traceback.print_exc()
+                    rows, filename = 0, None
+                    gaps = {"semua bagian": str(e)}
+                summary.append((name, tanggal, rows, filename, gaps))
+    finally:
+        if debug and context["driver"] is not None:
+            print("\n🟢 Browser tetap terbuka untuk pemeriksaan manual.")
+            print("💡 Tips debugging:")
+            print("  1. Cek apakah halaman web berisi tabel data")
+            print("  2. Inspect element untuk melihat struktur HTML tabel")
+            print("  3. Pastikan tanggal memiliki data")
+            print("  4. Cek console browser untuk error JavaScript")
+            print("  5. Periksa format angka di Excel apakah sesuai dengan web")
+        else:
+            disconnect(context)
+        context["telemetry"].finish()
+
+    print(f"\n{'=' * 60}")
+    print("📑 Ringkasan:")
+    for name, tanggal, rows, filename, gaps in summary:
+        status = f"✅ {filename}" if filename else "❌ tidak ada file"
+        print(f"  {name:<9} {tanggal}  {rows:>6} baris  {status}")
+        for bagian, reason in gaps.items():
+            print(f"      ⚠️ bagian hilang: {bagian} ({reason})")
+    return summary
+
+
+def backfill(report_names, dates, mode, workers, debug=False, cache=None,
+             browsers=BROWSER_POOL_SIZE, history=False):
+    """Backfill rentang tanggal; task yang sudah tercatat di checkpoint dilewati"""
+    context = open_session(mode, debug, cache, browsers)
+    specs = {name: get_report(name) for name in report_names}
+    save = partial(save_outputs, history=history)
+    try:
+        return run_backfill(context, specs, dates, workers, save, connect)
+    finally:
+        disconnect(context)
+        context["telemetry"].finish()
+
+
+def poll(report_names, interval_minutes, cycles=None):
+    """Polling laporan hari ini lewat session HTTP dengan request kondisional"""
+    specs = {name: get_report(name) for name in report_names}
+    poller = PagePoller(create_http_session(), connect=create_http_session)
+    try:
+        poll_reports(poller, specs, build_urls, interval_minutes, cycles)
+    except KeyboardInterrupt:
+        print("\n🛑 Polling dihentikan.")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    setup_logging(args.debug)
+    cache = PageCache() if args.use_cache else None
+
+    if args.poll is not None:
+        print(f"📑 Polling: {', '.join(args.reports)} setiap {args.poll:g} menit (HTTP)")
+        poll(args.reports, args.poll, args.poll_cycles)
+        return
+
+    if args.date_from:
+        dates = date_range(args.date_from, args.date_to)
+        print(f"📅 Backfill {args.date_from} s/d {args.date_to} ({len(dates)} hari)")
+        print(f"📑 Laporan: {', '.join(args.reports)} (mode: {args.mode}, worker: {args.workers})")
+        backfill(args.reports, dates, args.mode, args.workers, args.debug, cache,
+                 args.browsers, args.history)
+        return
+
+    dates = args.dates
+    if not dates:
+        dates = [get_tanggal_input()]
+    print(f"📅 Tanggal yang dipilih: {', '.join(dates)}")
+    print(f"📑 Laporan: {', '.join(args.reports)} (mode: {args.mode})")
+
+    run(args.reports, dates, args.mode, args.debug, cache, args.browsers, args.history,
+        args.retries, args.stream)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
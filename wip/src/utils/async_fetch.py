@@ -0,0 +1,138 @@
+import asyncio
+import os
+import time
+
+import aiohttp
+from dotenv import load_dotenv
+
+from utils.http_fetch import HTTP_TIMEOUT, parse_report_page
+from utils.logs import logger
+from utils.sink import ListSink
+from utils.telemetry import new_stats, outcome_for
+
+load_dotenv()
+# Jumlah request yang berjalan bersamaan, total dan per host
+ASYNC_CONCURRENCY = int(os.getenv("ASYNC_CONCURRENCY", "8"))
+ASYNC_PER_HOST = int(os.getenv("ASYNC_PER_HOST", "4"))
+
+
+async def fetch_bagian(client, semaphore, bagian, url, stats=None):
+    """Mengambil dan mem-parsing satu halaman bagian.
+
+    Jika stats diberikan: wait_s = antre di semaphore, navigation_s = request,
+    extract_s = parsing, size_bytes = ukuran halaman.
+    """
+    stats = stats if stats is not None else new_stats()
+    queued = time.perf_counter()
+    async with semaphore:
+        start = time.perf_counter()
+        stats["wait_s"] = start - queued
+        async with client.get(url) as response:
+            response.raise_for_status()
+            content = await response.read()
+        fetch_seconds = time.perf_counter() - start
+        stats["navigation_s"] = fetch_seconds
+        stats["size_bytes"] = len(content)
+
+    # Parsing lxml dijalankan di thread agar event loop tetap bebas
+    loop = asyncio.get_running_loop()
+    parse_start = time.perf_counter()
+    data = await loop.run_in_executor(None, parse_report_page, content)
+    stats["extract_s"] = time.perf_counter() - parse_start
+    logger.info("📥 %s: %.2f detik", bagian, fetch_seconds)
+    return data
+
+
+async def fetch_all(urls_dict, cookies=None, headers=None,
+                    concurrency=ASYNC_CONCURRENCY, per_host=ASYNC_PER_HOST, timeout=HTTP_TIMEOUT,
+                    stats=None):
+    """Mengambil semua URL bagian secara bersamaan.
+
+    Return list hasil dengan urutan yang sama seperti urls_dict; setiap elemen
+    berupa list baris, None (halaman error) atau Exception. Jika stats berupa
+    dict, stats[bagian] diisi waktu dan ukuran setiap halaman.
+    """
+    if stats is None:
+        stats = {}
+    connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=per_host)
+    # unsafe=True agar cookie tetap dikirim ke host berupa alamat IP
+    cookie_jar = aiohttp.CookieJar(unsafe=True)
+    if cookies:
+        cookie_jar.update_cookies(cookies)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    async with aiohttp.ClientSession(
+        connector=connector,
+        cookie_jar=cookie_jar,
+        headers=headers,
+        timeout=aiohttp.ClientTimeout(total=timeout),
+    ) as client:
+        tasks = [
+            fetch_bagian(client, semaphore, bagian, url, stats.setdefault(bagian, new_stats()))
+            for bagian, url in urls_dict.items()
+        ]
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def collect_data_async(session, urls_dict, jenis,
+                       concurrency=ASYNC_CONCURRENCY, per_host=ASYNC_PER_HOST, cache=None,
+                       telemetry=None, failed=None, sink=None):
+    """Versi asyncio dari collect_data; memakai cookie dari session HTTP yang sudah login.
+
+    Dengan sink, baris ditulis per bagian dan yang dikembalikan jumlah baris.
+    """
+    failed = failed if failed is not None else {}
+    output = sink if sink is not None else ListSink()
+    total = 0
+    logger.info("🚀 Memulai pengumpulan data %s (async, %d koneksi, %d per host) dari %d bagian...",
+                jenis, concurrency, per_host, len(urls_dict))
+
+    cookies = {cookie.name: cookie.value for cookie in session.cookies}
+    headers = {"User-Agent": session.headers.get("User-Agent", "")}
+
+    start = time.perf_counter()
+    results, to_fetch = cache.split(urls_dict) if cache else ({}, urls_dict)
+    if results:
+        logger.info("💾 %d bagian diambil dari cache, %d diambil dari web",
+                    len(results), len(to_fetch))
+        if telemetry:
+            for bagian, rows in results.items():
+                telemetry.record(jenis, bagian, urls_dict[bagian], "cache", rows=len(rows))
+    if to_fetch:
+        stats = {}
+        fetched = asyncio.run(
+            fetch_all(to_fetch, cookies, headers, concurrency, per_host, stats=stats)
+        )
+        for (bagian, url), data in zip(to_fetch.items(), fetched):
+            results[bagian] = data
+            # [] bisa berarti tabel tidak ditemukan, jadi hanya hasil lengkap yang di-cache
+            if cache and isinstance(data, list) and data:
+                cache.put(url, data)
+            if telemetry:
+                raised = isinstance(data, Exception)
+                telemetry.record_stats(
+                    jenis, bagian, url, "failed" if raised else outcome_for(data), stats[bagian],
+                    rows=0 if raised else len(data or []),
+                )
+
+    # Tulis hasil sesuai urutan bagian
+    for bagian in urls_dict:
+        data = results.pop(bagian)
+        if isinstance(data, Exception):
+            logger.warning("⚠️ Gagal memuat halaman untuk %s: %s", bagian, data)
+            failed[bagian] = str(data) or type(data).__name__
+            continue
+        if data is None:
+            logger.warning("⚠️ Halaman error untuk bagian %s", bagian)
+            failed[bagian] = "halaman error"
+            continue
+        output.write(bagian, data)
+        total += len(data)
+        if data:
+            logger.info("✅ Berhasil mengambil %d baris dari %s", len(data), bagian)
+        else:
+            logger.info("⚠️ Tidak ada data dari %s", bagian)
+
+    logger.info("\n🎯 Total data terkumpul: %d baris (%.2f detik)",
+                total, time.perf_counter() - start)
+    return output.close() if sink is None else total
\ No newline at end of file
@@ -0,0 +1,306 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+from utils.common import build_urls, extract_table_data
+from utils.http_fetch import fetch_table
+from utils.tab_pool import TabPool
+from utils.telemetry import new_stats, outcome_for
+
+CHECKPOINT_FOLDER = os.path.join("data", "checkpoints")
+
+
+def date_range(date_from, date_to):
+    """Semua tanggal dari date_from sampai date_to (inklusif), format YYYY-MM-DD"""
+    start = datetime.strptime(date_from, "%Y-%m-%d")
+    end = datetime.strptime(date_to, "%Y-%m-%d")
+    if end < start:
+        raise ValueError(f"Tanggal akhir {date_to} sebelum tanggal awal {date_from}")
+    return [
+        (start + timedelta(days=offset)).strftime("%Y-%m-%d")
+        for offset in range((end - start).days + 1)
+    ]
+
+
+class CheckpointJournal:
+    """Jurnal JSON lines berisi task (laporan, tanggal, bagian) yang sudah selesai.
+
+    Setiap baris ditulis dan di-fsync segera, jadi backfill yang terhenti
+    bisa dilanjutkan tanpa mengambil ulang halaman yang sudah selesai.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.done = {}
+        self.saved = set()
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self.load()
+
+    def load(self):
+        """Membaca jurnal; entri terakhir untuk setiap task yang berlaku"""
+        self.done = {}
+        self.saved = set()
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Baris terakhir bisa terpotong jika proses mati saat menulis
+                    continue
+
+                if entry.get("type") == "saved":
+                    self.saved.add((entry["report"], entry["date"]))
+                    continue
+
+                key = (entry["report"], entry["date"], entry["bagian"])
+                if entry["status"] == "ok":
+                    self.done[key] = entry["rows"]
+                else:
+                    self.done.pop(key, None)
+
+    def append(self, entry):
+        with self.lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def record(self, report, tanggal, bagian, rows, error=None):
+        """Mencatat hasil satu task; task dengan error akan diulang saat resume"""
+        entry = {
+            "report": report,
+            "date": tanggal,
+            "bagian": bagian,
+            "status": "error" if error else "ok",
+            "rows": rows if not error else [],
+            "error": error,
+            "at": datetime.now().isoformat(timespec="seconds"),
+        }
+        self.append(entry)
+        with self.lock:
+            key = (report, tanggal, bagian)
+            if error:
+                self.done.pop(key, None)
+            else:
+                self.done[key] = rows
+
+    def mark_saved(self, report, tanggal, filename):
+        self.append({"type": "saved", "report": report, "date": tanggal, "file": filename})
+        self.saved.add((report, tanggal))
+
+    def is_done(self, report, tanggal, bagian):
+        return (report, tanggal, bagian) in self.done
+
+
+def build_tasks(report_specs, dates):
+    """Semua task (laporan, tanggal, bagian, url) untuk backfill"""
+    tasks = []
+    for tanggal in dates:
+        for name, spec in report_specs.items():
+            urls = build_urls(spec["base_path"], tanggal, spec["bagian"])
+            for bagian, url in urls.items():
+                tasks.append((name, tanggal, bagian, url))
+    return tasks
+
+
+def run_http_tasks(session, tasks, journal, workers, cache=None, record=None):
+    """Menjalankan task lewat session HTTP di thread pool"""
+    stats = {}
+
+    def fetch(task):
+        name, tanggal, bagian, url = task
+        return fetch_table(session, url, stats=stats.setdefault(task, new_stats()))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(fetch, task): task for task in tasks}
+        for done_count, future in enumerate(as_completed(futures), 1):
+            task = futures[future]
+            name, tanggal, bagian, url = task
+            try:
+                data = future.result()
+            except Exception as e:
+                journal.record(name, tanggal, bagian, [], error=str(e))
+                print(f"⚠️ [{done_count}/{len(tasks)}] {name} {tanggal} {bagian}: {e}")
+                if record:
+                    record(name, bagian, url, "failed", stats[task])
+                continue
+
+            if record:
+                record(name, bagian, url, outcome_for(data), stats[task], len(data or []))
+
+            if data is None:
+                journal.record(name, tanggal, bagian, [], error="halaman error")
+                print(f"⚠️ [{done_count}/{len(tasks)}] {name} {tanggal} {bagian}: halaman error")
+            else:
+                journal.record(name, tanggal, bagian, data)
+                if cache and data:
+                    cache.put(url, data)
+                print(f"✅ [{done_count}/{len(tasks)}] {name} {tanggal} {bagian}: {len(data)} baris")
+
+
+def run_browser_tasks(driver, tasks, journal, workers, cache=None, record=None):
+    """Menjalankan task di tab pool browser; setiap tab adalah satu worker"""
+    lookup = {(name, tanggal, bagian): url for name, tanggal, bagian, url in tasks}
+    pool = TabPool(driver, size=workers)
+
+    try:
+        for done_count, (key, url, ready, waited, row_count, navigated) in enumerate(
+            pool.run((key, url) for key, url in lookup.items()), 1
+        ):
+            name, tanggal, bagian = key
+            stats = new_stats()
+            stats["navigation_s"] = navigated
+            stats["wait_s"] = waited - navigated
+            try:
+                page_source = driver.page_source
+                stats["size_bytes"] = len(page_source.encode("utf-8"))
+                if "error" in page_source.lower() or "404" in driver.title:
+                    journal.record(name, tanggal, bagian, [], error="halaman error")
+                    print(f"⚠️ [{done_count}/{len(tasks)}] {name} {tanggal} {bagian}: halaman error")
+                    if record:
+                        record(name, bagian, url, "error_page", stats)
+                    continue
+                extract_start = time.perf_counter()
+                data = extract_table_data(driver)
+                stats["extract_s"] = time.perf_counter() - extract_start
+            except Exception as e:
+                journal.record(name, tanggal, bagian, [], error=str(e))
+                print(f"⚠️ [{done_count}/{len(tasks)}] {name} {tanggal} {bagian}: {e}")
+                if record:
+                    record(name, bagian, url, "failed", stats)
+                continue
+
+            if record:
+                record(name, bagian, url, outcome_for(data, ready), stats, len(data))
+            if not ready:
+                # Baris kosong/parsial tidak di-checkpoint agar halaman diambil ulang saat resume
+                journal.record(name, tanggal, bagian, [], error=f"timeout setelah {waited:.0f} detik")
+                print(f"⚠️ [{done_count}/{len(tasks)}] {name} {tanggal} {bagian}: "
+                      f"timeout setelah {waited:.0f} detik")
+                continue
+            journal.record(name, tanggal, bagian, data)
+            if cache and data:
+                cache.put(url, data)
+            print(f"✅ [{done_count}/{len(tasks)}] {name} {tanggal} {bagian}: "
+                  f"{len(data)} baris ({waited:.2f} detik)")
+    finally:
+        pool.close()
+
+
+def run_pool_tasks(pool, tasks, journal, cache=None, record=None):
+    """Menjalankan task di browser pool; setiap browser adalah satu worker"""
+    lookup = {(name, tanggal, bagian): url for name, tanggal, bagian, url in tasks}
+
+    for done_count, (key, url, data, ready, stats) in enumerate(pool.run(lookup.items()), 1):
+        name, tanggal, bagian = key
+        waited = stats["wait_s"]
+        if record:
+            failed = isinstance(data, Exception)
+            record(name, bagian, url, "failed" if failed else outcome_for(data, ready), stats,
+                   0 if failed else len(data or []))
+        if isinstance(data, Exception):
+            journal.record(name, tanggal, bagian, [], error=str(data))
+            print(f"⚠️ [{done_count}/{len(tasks)}] {name} {tanggal} {bagian}: {data}")
+        elif data is None:
+            journal.record(name, tanggal, bagian, [], error="halaman error")
+            print(f"⚠️ [{done_count}/{len(tasks)}] {name} {tanggal} {bagian}: halaman error")
+        elif not ready:
+            # Baris kosong/parsial tidak di-checkpoint agar halaman diambil ulang saat resume
+            journal.record(name, tanggal, bagian, [], error=f"timeout setelah {waited:.0f} detik")
+            print(f"⚠️ [{done_count}/{len(tasks)}] {name} {tanggal} {bagian}: "
+                  f"timeout setelah {waited:.0f} detik")
+        else:
+            journal.record(name, tanggal, bagian, data)
+            if cache and data:
+                cache.put(url, data)
+            print(f"✅ [{done_count}/{len(tasks)}] {name} {tanggal} {bagian}: "
+                  f"{len(data)} baris ({waited:.2f} detik)")
+
+
+def run_backfill(context, report_specs, dates, workers, save_report, connect, journal_path=None):
+    """Backfill semua (laporan, tanggal, bagian) dengan checkpoint.
+
+    save_report(spec, tanggal, rows) dipanggil untuk setiap laporan/tanggal
+    setelah semua bagiannya selesai. connect(context) dipanggil hanya jika
+    masih ada halaman yang harus diambil dari web.
+    """
+    journal_path = journal_path or os.path.join(
+        CHECKPOINT_FOLDER, f"backfill-{dates[0]}-{dates[-1]}.jsonl"
+    )
+    journal = CheckpointJournal(journal_path)
+
+    tasks = build_tasks(report_specs, dates)
+    pending = [task for task in tasks if not journal.is_done(*task[:3])]
+    print(f"🗂️ Checkpoint: {journal_path}")
+    print(f"📋 {len(tasks)} task, {len(tasks) - len(pending)} sudah selesai, {len(pending)} akan diambil")
+
+    telemetry = context["telemetry"]
+
+    def record(name, bagian, url, outcome, stats=None, rows=0):
+        if telemetry:
+            telemetry.record_stats(report_specs[name]["jenis"], bagian, url, outcome,
+                                   stats or new_stats(), rows=rows)
+
+    cache = context["cache"]
+    if cache and pending:
+        to_fetch = []
+        for task in pending:
+            rows = cache.get(task[3])
+            if rows is None:
+                to_fetch.append(task)
+            else:
+                journal.record(*task[:3], rows)
+                record(task[0], task[2], task[3], "cache", rows=len(rows))
+        if len(to_fetch) < len(pending):
+            print(f"💾 {len(pending) - len(to_fetch)} task diambil dari cache")
+        pending = to_fetch
+
+    if pending:
+        connect(context)
+        if context["mode"] == "browser":
+            run_browser_tasks(context["driver"], pending, journal, workers, cache, record)
+        elif context["mode"] == "pool":
+            run_pool_tasks(context["pool"], pending, journal, cache, record)
+        else:
+            run_http_tasks(context["session"], pending, journal, workers, cache, record)
+
+    # Simpan file untuk setiap laporan/tanggal, baris digabung sesuai urutan bagian
+    summary = []
+    for tanggal in dates:
+        for name, spec in report_specs.items():
+            missing = [b for b in spec["bagian"] if not journal.is_done(name, tanggal, b)]
+            if (name, tanggal) in journal.saved and not missing:
+                summary.append((name, tanggal, None, "sudah tersimpan", missing))
+                continue
+
+            rows = []
+            for bagian in spec["bagian"]:
+                for row in journal.done.get((name, tanggal, bagian), []):
+                    rows.append([bagian] + row)
+
+            filename = save_report(spec, tanggal, rows) if rows else None
+            if filename and not missing:
+                journal.mark_saved(name, tanggal, filename)
+            summary.append((name, tanggal, len(rows), filename, missing))
+
+    print(f"\n{'=' * 60}")
+    print("📑 Ringkasan backfill:")
+    for name, tanggal, rows, filename, missing in summary:
+        rows_text = f"{rows:>6} baris" if rows is not None else "      -      "
+        status = f"✅ {filename}" if filename else "❌ tidak ada file"
+        print(f"  {name:<9} {tanggal}  {rows_text}  {status}")
+        if missing:
+            print(f"      ⚠️ belum lengkap: {', '.join(missing)} (jalankan ulang untuk melanjutkan)")
+    return summary
\ No newline at end of file
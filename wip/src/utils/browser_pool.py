@@ -0,0 +1,211 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from dotenv import load_dotenv
+
+from utils.common import create_driver, extract_table_data, login
+from utils.driver_profile import shutdown_driver
+from utils.logs import logger
+from utils.sink import ListSink, OrderedSink
+from utils.telemetry import new_stats, outcome_for
+from utils.waits import wait_for_table
+
+try:
+    import psutil
+except ImportError:  # psutil opsional, hanya untuk menghitung memori yang tersedia
+    psutil = None
+
+load_dotenv()
+# Perkiraan memori satu Chrome headless yang membuka satu halaman laporan
+CHROME_MEMORY_MB = int(os.getenv("CHROME_MEMORY_MB", "400"))
+
+
+def default_pool_size():
+    """Jumlah browser sesuai core CPU dan memori yang tersedia (minimal 1)"""
+    size = os.cpu_count() or 1
+    if psutil is not None:
+        available_mb = psutil.virtual_memory().available // (1024 * 1024)
+        size = min(size, available_mb // CHROME_MEMORY_MB)
+    return max(1, size)
+
+
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE") or default_pool_size())
+
+
+class BrowserPool:
+    """Beberapa Chrome headless, masing-masing dengan sesi login sendiri.
+
+    Worker mengambil task (key, url) dari satu antrian, sehingga halaman yang
+    bergantung pada JavaScript tetap bisa diambil secara paralel.
+    """
+
+    def __init__(self, size=BROWSER_POOL_SIZE, debug=False):
+        self.size = max(1, size)
+        self.debug = debug
+        self.drivers = []
+
+    def start(self):
+        """Membuka dan login semua browser secara bersamaan"""
+        print(f"🧭 Menyiapkan {self.size} browser...")
+
+        def start_one(_):
+            driver = create_driver(debug=self.debug)
+            try:
+                # Tanpa cookie tersimpan: satu session bersama untuk N browser tidak
+                # terbukti aman dipakai bersamaan di ERP
+                login(driver, reuse_session=False)
+            except Exception:
+                shutdown_driver(driver)
+                raise
+            return driver
+
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            futures = [executor.submit(start_one, i) for i in range(self.size)]
+            errors = []
+            for future in futures:
+                try:
+                    self.drivers.append(future.result())
+                except Exception as e:
+                    errors.append(e)
+
+        if not self.drivers:
+            raise RuntimeError(f"Tidak ada browser yang berhasil login: {errors[0]}")
+        if errors:
+            print(f"⚠️ {len(errors)} browser gagal login, lanjut dengan {len(self.drivers)} browser")
+        return self
+
+    def close(self):
+        for driver in self.drivers:
+            shutdown_driver(driver)
+        self.drivers = []
+
+    def fetch_page(self, driver, url):
+        """Membuka satu halaman di driver milik worker.
+
+        Return (baris, siap, stats); baris None jika halaman error.
+        """
+        stats = new_stats()
+        start = time.perf_counter()
+        driver.get(url)
+        stats["navigation_s"] = time.perf_counter() - start
+        ready, stats["wait_s"], row_count = wait_for_table(driver)
+
+        page_source = driver.page_source
+        stats["size_bytes"] = len(page_source.encode("utf-8"))
+        if "error" in page_source.lower() or "404" in driver.title:
+            return None, ready, stats
+
+        extract_start = time.perf_counter()
+        data = extract_table_data(driver, highlight=self.debug)
+        stats["extract_s"] = time.perf_counter() - extract_start
+        return data, ready, stats
+
+    def run(self, tasks):
+        """Menjalankan semua task (key, url) di semua browser.
+
+        Generator ini yield (key, url, hasil, siap, stats) sesuai urutan selesai;
+        hasil berupa list baris, None (halaman error) atau Exception, stats berisi
+        navigation_s, wait_s, extract_s dan size_bytes.
+        """
+        task_queue = queue.Queue()
+        for task in tasks:
+            task_queue.put(task)
+        total = task_queue.qsize()
+        if total == 0:
+            return
+        if not self.drivers:
+            self.start()
+        results = queue.Queue()
+
+        def worker(driver):
+            while True:
+                try:
+                    key, url = task_queue.get_nowait()
+                except queue.Empty:
+                    return
+                start = time.perf_counter()
+                try:
+                    results.put((key, url) + self.fetch_page(driver, url))
+                except Exception as e:
+                    stats = new_stats()
+                    stats["navigation_s"] = time.perf_counter() - start
+                    results.put((key, url, e, False, stats))
+
+        threads = [
+            threading.Thread(target=worker, args=(driver,), daemon=True)
+            for driver in self.drivers[:total]
+        ]
+        for thread in threads:
+            thread.start()
+
+        for _ in range(total):
+            yield results.get()
+
+        for thread in threads:
+            thread.join()
+
+
+def collect_data_pool(pool, urls_dict, jenis, cache=None, telemetry=None, failed=None, sink=None):
+    """Versi browser pool dari collect_data; hasil digabung sesuai urutan bagian.
+
+    Dengan sink, baris ditulis per bagian begitu selesai dan yang dikembalikan
+    jumlah baris.
+    """
+    failed = failed if failed is not None else {}
+    output = sink if sink is not None else OrderedSink(ListSink(), urls_dict)
+    total = 0
+    bagian_list = list(urls_dict)
+    cached, to_fetch = cache.split(urls_dict) if cache else ({}, urls_dict)
+    if cached:
+        logger.info("💾 %d bagian diambil dari cache, %d diambil dari web",
+                    len(cached), len(to_fetch))
+        for bagian, rows in cached.items():
+            output.write(bagian, rows)
+            total += len(rows)
+            if telemetry:
+                telemetry.record(jenis, bagian, urls_dict[bagian], "cache", rows=len(rows))
+
+    logger.info("🚀 Memulai pengumpulan data %s dari %d bagian (%d browser)...",
+                jenis, len(to_fetch), min(pool.size, len(to_fetch)))
+
+    start = time.perf_counter()
+    for bagian, url, data, ready, stats in pool.run(to_fetch.items()):
+        i = bagian_list.index(bagian)
+        logger.info("\n📥 [%d/%d] %s - %s (%.2f detik)",
+                    i + 1, len(urls_dict), jenis, bagian, stats["wait_s"])
+
+        if telemetry:
+            raised = isinstance(data, Exception)
+            telemetry.record_stats(
+                jenis, bagian, url, "failed" if raised else outcome_for(data, ready), stats,
+                rows=0 if raised else len(data or []),
+            )
+        if isinstance(data, Exception):
+            logger.warning("⚠️ Gagal memuat halaman untuk %s: %s", bagian, data)
+            failed[bagian] = str(data) or type(data).__name__
+            continue
+        if data is None:
+            logger.warning("⚠️ Halaman error untuk bagian %s", bagian)
+            failed[bagian] = "halaman error"
+            continue
+
+        if data:
+            output.write(bagian, data)
+            total += len(data)
+            if cache and ready:
+                cache.put(url, data)
+            logger.info("✅ Berhasil mengambil %d baris dari %s", len(data), bagian)
+        elif not ready:
+            failed[bagian] = f"timeout setelah {stats['wait_s']:.0f} detik"
+            logger.warning("⚠️ Tidak ada data dari %s (timeout)", bagian)
+        else:
+            output.write(bagian, [])
+            logger.info("⚠️ Tidak ada data dari %s", bagian)
+
+    logger.info("\n🎯 Total data terkumpul: %d baris (%.2f detik)",
+                total, time.perf_counter() - start)
+    # Tanpa sink: gabungkan sesuai urutan bagian, bukan urutan selesai
+    return output.close() if sink is None else total
\ No newline at end of file
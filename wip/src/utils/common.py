@@ -0,0 +1,340 @@
+import logging
+import os
+import time
+from datetime import datetime
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from dotenv import load_dotenv
+from utils.http_fetch import (
+    create_session,
+    login_session,
+    restore_session,
+    session_from_driver,
+)
+from utils.waits import wait_for_login_form, wait_for_login_redirect
+from utils.tab_pool import TabPool
+from utils.js_extract import extract_table_rows, highlight_table_rows
+from utils.driver_profile import build_chrome_options, block_heavy_resources
+from utils.telemetry import new_stats, outcome_for
+from utils.logs import logger
+from utils.sink import ListSink, OrderedSink
+from utils.session_store import clear_cookies, cookies_from_session, load_cookies, save_cookies
+
+load_dotenv()
+WEB_URL = os.getenv("WEB_URL")
+EMAIL = os.getenv("EMAIL")
+PASSWORD = os.getenv("PASSWORD")
+CHROMEDRIVER_PATH = os.getenv("CHROMEDRIVER_PATH")
+# "browser" (default), "http" atau "async"
+FETCH_MODE = os.getenv("FETCH_MODE", "browser").lower()
+# Cara login untuk mode http: "form" (POST langsung) atau "selenium"
+HTTP_LOGIN = os.getenv("HTTP_LOGIN", "form").lower()
+
+
+def create_driver(debug=False):
+    """Chrome headless cepat untuk produksi, atau browser terlihat jika debug=True"""
+    chrome_options = build_chrome_options(debug)
+    service = Service(CHROMEDRIVER_PATH)
+    driver = webdriver.Chrome(service=service, options=chrome_options)
+    if not debug:
+        block_heavy_resources(driver)
+    return driver
+
+
+def restore_driver_session(driver):
+    """Memasang cookie login tersimpan ke browser; return True jika tidak diarahkan ke login"""
+    cookies = load_cookies(WEB_URL, EMAIL)
+    if not cookies:
+        return False
+
+    for cookie in cookies:
+        # Domain dibiarkan kosong agar cookie dipasang untuk host yang sedang dibuka
+        driver.add_cookie({"name": cookie["name"], "value": cookie["value"],
+                           "path": cookie.get("path", "/")})
+    driver.get(WEB_URL)
+    if driver.find_elements(By.NAME, "password"):
+        print("🔄 Session tersimpan sudah kedaluwarsa, login ulang...")
+        driver.delete_all_cookies()
+        clear_cookies()
+        return False
+    print("♻️ Memakai session login tersimpan")
+    return True
+
+
+def login(driver, reuse_session=True):
+    """Login di browser; dengan reuse_session cookie tersimpan dicoba dulu dan disimpan setelah login.
+
+    reuse_session=False untuk browser pool: setiap browser harus punya session server sendiri.
+    """
+    print("🔐 Login ke sistem...")
+    driver.get(WEB_URL)
+    if reuse_session:
+        try:
+            if restore_driver_session(driver):
+                return
+        except Exception as e:
+            print(f"⚠️ Gagal memakai session tersimpan: {e}")
+
+    try:
+        waited = wait_for_login_form(driver)
+        login_url = driver.current_url
+        driver.find_element(By.NAME, "email").send_keys(EMAIL)
+        driver.find_element(By.NAME, "password").send_keys(PASSWORD)
+        driver.find_element(By.TAG_NAME, "form").submit()
+        waited += wait_for_login_redirect(driver, login_url)
+        print(f"✅ Login berhasil. (menunggu {waited:.2f} detik)")
+        if reuse_session:
+            save_cookies(driver.get_cookies(), WEB_URL, EMAIL)
+    except Exception as e:
+        print(f"❌ Gagal login: {e}")
+        raise
+
+
+def create_http_session():
+    """Session HTTP yang membawa cookie login; cookie tersimpan dipakai ulang jika masih valid"""
+    session = create_session()
+    if restore_session(session):
+        return session
+
+    if HTTP_LOGIN == "selenium":
+        driver = create_driver()
+        try:
+            login(driver)
+            return session_from_driver(driver)
+        finally:
+            driver.quit()
+    login_session(session)
+    save_cookies(cookies_from_session(session), WEB_URL, EMAIL)
+    return session
+
+
+def highlight_rows(driver, rows, duration=1.5):
+    """Highlight sekaligus semua baris <tr> yang ingin di-copy"""
+    try:
+        driver.execute_script(
+            """
+            const rows = arguments[0];
+            for (const row of rows) {
+                row.style.border = '2px solid red';
+                row.style.backgroundColor = 'yellow';
+            }
+        """,
+            rows,
+        )
+
+        time.sleep(duration)
+
+        driver.execute_script(
+            """
+            const rows = arguments[0];
+            for (const row of rows) {
+                row.style.border = '';
+                row.style.backgroundColor = '';
+            }
+        """,
+            rows,
+        )
+    except Exception as e:
+        logger.warning("⚠️ Gagal highlight rows: %s", e)
+
+
+def extract_table_data(driver, highlight=False):
+    """Mengambil data tabel utama dengan satu execute_script (satu round-trip WebDriver)"""
+    logger.debug("🔍 Mencari tabel data...")
+
+    try:
+        selector, rows = extract_table_rows(driver)
+    except Exception as e:
+        logger.warning("⚠️ Ekstraksi JavaScript gagal, memakai ekstraksi per elemen: %s", e)
+        return extract_table_data_elements(driver, highlight)
+
+    if rows is None:
+        logger.warning("❌ Tidak dapat menemukan tabel dengan selector apapun")
+        logger.debug("📄 Struktur HTML halaman:\n%s", driver.page_source[:1000])
+        return []
+
+    logger.debug("✅ Tabel ditemukan dengan selector: %s", selector)
+    logger.debug("📊 Total baris ditemukan: %d", len(rows))
+
+    if len(rows) <= 2:
+        logger.info("⚠️ Tabel kosong atau hanya ada header")
+        return []
+
+    data_rows = rows[1:-1]
+    logger.debug("📈 Baris data yang akan diambil: %d", len(data_rows))
+
+    if data_rows and highlight:
+        highlight_table_rows(driver, selector, duration=1.5)
+
+    data = [row_data for row_data in data_rows if row_data]
+    if logger.isEnabledFor(logging.DEBUG):
+        for i, row_data in enumerate(data_rows):
+            if row_data:
+                logger.debug("  Baris %d: %s", i + 1, row_data)
+
+    logger.debug("✅ Total data berhasil diambil: %d baris", len(data))
+    return data
+
+
+def extract_table_data_elements(driver, highlight=False):
+    """Mengambil data dari tabel utama dan highlight semua baris yang akan diambil sekaligus"""
+    logger.debug("🔍 Mencari tabel data (per elemen)...")
+
+    selectors = [
+        "td.judul > table > tbody",
+        "table > tbody",
+        ".judul table tbody",
+        "table tbody",
+    ]
+
+    table = None
+    for selector in selectors:
+        try:
+            table = driver.find_element(By.CSS_SELECTOR, selector)
+            logger.debug("✅ Tabel ditemukan dengan selector: %s", selector)
+            break
+        except:
+            continue
+
+    if not table:
+        logger.warning("❌ Tidak dapat menemukan tabel dengan selector apapun")
+        logger.debug("📄 Struktur HTML halaman:\n%s", driver.page_source[:1000])
+        return []
+
+    try:
+        rows = table.find_elements(By.TAG_NAME, "tr")
+        logger.debug("📊 Total baris ditemukan: %d", len(rows))
+
+        if len(rows) <= 2:
+            logger.info("⚠️ Tabel kosong atau hanya ada header")
+            return []
+
+        data_rows = rows[1:-1]
+        logger.debug("📈 Baris data yang akan diambil: %d", len(data_rows))
+
+        if data_rows and highlight:
+            highlight_rows(driver, data_rows, duration=1.5)
+
+        data = []
+        for i, row in enumerate(data_rows):
+            cols = row.find_elements(By.TAG_NAME, "td")
+            if cols:
+                row_data = [col.text.strip() for col in cols]
+                data.append(row_data)
+                logger.debug("  Baris %d: %s", i + 1, row_data)
+
+        logger.debug("✅ Total data berhasil diambil: %d baris", len(data))
+        return data
+
+    except Exception as e:
+        logger.warning("❌ Gagal ekstrak data: %s", e)
+        return []
+
+
+def collect_data(driver, urls_dict, jenis, debug=False, cache=None, telemetry=None, failed=None,
+                 sink=None):
+    """Mengambil semua bagian memakai tab pool berukuran tetap.
+
+    Beberapa tab memuat halaman bersamaan, setiap tab dipanen begitu siap lalu
+    dipakai ulang, sehingga jumlah tab (dan memori browser) tidak bertambah.
+    Jika failed berupa dict, bagian yang gagal dicatat di sana beserta alasannya.
+    Jika sink diberikan, baris setiap bagian ditulis ke sink begitu selesai dan
+    yang dikembalikan hanya jumlah baris; tanpa sink, return list semua baris.
+    """
+    failed = failed if failed is not None else {}
+    output = sink if sink is not None else OrderedSink(ListSink(), urls_dict)
+    total = 0
+    bagian_list = list(urls_dict)
+    cached, to_fetch = cache.split(urls_dict) if cache else ({}, urls_dict)
+    if cached:
+        logger.info("💾 %d bagian diambil dari cache, %d diambil dari web",
+                    len(cached), len(to_fetch))
+        for bagian, rows in cached.items():
+            output.write(bagian, rows)
+            total += len(rows)
+            if telemetry:
+                telemetry.record(jenis, bagian, urls_dict[bagian], "cache", rows=len(rows))
+    pool = TabPool(driver)
+
+    logger.info("🚀 Memulai pengumpulan data %s dari %d bagian (%d tab)...",
+                jenis, len(to_fetch), min(pool.size, len(to_fetch)))
+
+    try:
+        for bagian, url, ready, waited, row_count, navigated in pool.run(to_fetch.items()):
+            i = bagian_list.index(bagian)
+            stats = new_stats()
+            stats["navigation_s"] = navigated
+            stats["wait_s"] = waited - navigated
+            logger.info("\n📥 [%d/%d] Mengambil data %s - %s...", i + 1, len(urls_dict), jenis, bagian)
+            logger.debug("🔗 URL: %s", url)
+
+            if ready:
+                logger.debug("⏱️ Tabel siap dalam %.2f detik (%d baris)", waited, row_count)
+            else:
+                logger.info("⏱️ Tabel belum siap setelah %.2f detik", waited)
+
+            try:
+                logger.debug("📍 Current URL: %s", driver.current_url)
+
+                page_source = driver.page_source
+                stats["size_bytes"] = len(page_source.encode("utf-8"))
+                if "error" in page_source.lower() or "404" in driver.title:
+                    logger.warning("⚠️ Halaman error untuk bagian %s", bagian)
+                    failed[bagian] = "halaman error"
+                    if telemetry:
+                        telemetry.record_stats(jenis, bagian, url, "error_page", stats)
+                    continue
+
+            except Exception as e:
+                logger.warning("⚠️ Gagal memuat halaman untuk %s: %s", bagian, e)
+                failed[bagian] = str(e)
+                if telemetry:
+                    telemetry.record_stats(jenis, bagian, url, "failed", stats)
+                continue
+
+            extract_start = time.perf_counter()
+            data = extract_table_data(driver, highlight=debug)
+            stats["extract_s"] = time.perf_counter() - extract_start
+            if telemetry:
+                telemetry.record_stats(jenis, bagian, url, outcome_for(data, ready), stats,
+                                       rows=len(data))
+            # [] bisa berarti tabel tidak ditemukan, jadi hanya hasil lengkap yang di-cache
+            if cache and ready and data:
+                cache.put(url, data)
+
+            if data:
+                output.write(bagian, data)
+                total += len(data)
+                logger.info("✅ Berhasil mengambil %d baris dari %s (tabel siap dalam %.2f detik)",
+                            len(data), bagian, waited)
+            elif not ready:
+                failed[bagian] = f"timeout setelah {waited:.0f} detik"
+                logger.warning("⚠️ Tidak ada data dari %s (timeout)", bagian)
+            else:
+                output.write(bagian, [])
+                logger.info("⚠️ Tidak ada data dari %s", bagian)
+    finally:
+        pool.close()
+
+    logger.info("\n🎯 Total data terkumpul: %d baris", total)
+    # Tanpa sink: gabungkan sesuai urutan bagian, bukan urutan selesai
+    return output.close() if sink is None else total
+
+
+def build_urls(base_path, tanggal, bagian_mapping):
+    """Membuat URL laporan untuk setiap bagian"""
+    urls = {}
+    for bagian, bagian_id in bagian_mapping.items():
+        urls[bagian] = f"{WEB_URL}/{base_path}?d={tanggal}&s=&b={bagian_id}&m=all"
+    return urls
+
+
+def get_tanggal_input():
+    """Meminta input tanggal dari user, default ke hari ini"""
+    input_tanggal = input(
+        "📅 Masukkan tanggal (format: YYYY-MM-DD) [default: hari ini]: "
+    ).strip()
+    if input_tanggal == "":
+        input_tanggal = datetime.today().strftime("%Y-%m-%d")
+    return input_tanggal
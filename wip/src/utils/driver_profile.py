@@ -0,0 +1,58 @@
+from selenium.webdriver.chrome.options import Options
+
+# Resource yang tidak dibutuhkan untuk membaca tabel laporan
+BLOCKED_URL_PATTERNS = [
+    "*.css",
+    "*.png",
+    "*.jpg",
+    "*.jpeg",
+    "*.gif",
+    "*.svg",
+    "*.webp",
+    "*.ico",
+    "*.woff",
+    "*.woff2",
+    "*.ttf",
+    "*.otf",
+]
+
+
+def build_chrome_options(debug=False):
+    """Opsi Chrome: debug = browser terlihat dan maximized, selain itu profil produksi headless"""
+    chrome_options = Options()
+
+    if debug:
+        chrome_options.add_argument("--start-maximized")
+        return chrome_options
+
+    chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument("--window-size=1920,1080")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+    chrome_options.add_experimental_option(
+        "prefs", {"profile.managed_default_content_settings.images": 2}
+    )
+    # Kembali setelah DOMContentLoaded; kesiapan tabel ditunggu oleh wait_for_table
+    chrome_options.page_load_strategy = "eager"
+    return chrome_options
+
+
+def block_heavy_resources(driver):
+    """Memblokir CSS, gambar dan font lewat Chrome DevTools Protocol"""
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    except Exception as e:
+        print(f"⚠️ Gagal memblokir resource: {e}")
+
+
+def shutdown_driver(driver):
+    """Menutup semua tab dan proses chromedriver"""
+    if driver is None:
+        return
+    try:
+        driver.quit()
+        print("🛑 Browser ditutup.")
+    except Exception as e:
+        print(f"⚠️ Gagal menutup browser: {e}")
\ No newline at end of file
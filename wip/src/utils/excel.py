@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+import re
+from datetime import datetime
+
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+
+# Angka dengan koma ribuan opsional, misalnya "1,234.50" atau "-12"
+NUMERIC_PATTERN = re.compile(r'^-?\d+\.?\d*$')
+
+
+def number_format_for(decimal_places):
+    """Format number Excel untuk jumlah digit desimal tertentu"""
+    if decimal_places <= 0:
+        return '0'
+    return '0.' + '0' * decimal_places
+
+
+def cell_decimals(value):
+    """Jumlah desimal satu sel angka (koma ribuan diabaikan), None jika bukan angka"""
+    if value is None:
+        return None
+    cleaned = str(value).strip().replace(',', '')
+    if not cleaned or not NUMERIC_PATTERN.match(cleaned):
+        return None
+    _, _, fraction = cleaned.partition('.')
+    return len(fraction)
+
+
+def column_schema(column, numeric_cells, total_cells, decimal_places):
+    """Entri schema manifest untuk satu kolom (nomor kolom mulai dari 1)"""
+    if not numeric_cells:
+        return {"column": column, "type": "text", "number_format": None}
+    return {
+        "column": column,
+        "type": "numeric" if numeric_cells == total_cells else "mixed",
+        "number_format": number_format_for(decimal_places),
+    }
+
+
+def infer_column(values):
+    """Mendeteksi sel numerik satu kolom sekaligus.
+
+    Return (mask sel numerik, nilai float, jumlah desimal terbanyak) atau None
+    jika kolom tidak berisi angka.
+    """
+    series = pd.Series(values, dtype=object)
+    text = series.where(series.notna(), '').astype(str).str.strip()
+    cleaned = text.str.replace(',', '', regex=False)
+    mask = (text != '') & cleaned.str.match(NUMERIC_PATTERN)
+    if not mask.any():
+        return None
+
+    numbers = pd.to_numeric(cleaned[mask], errors='coerce')
+    mask[mask] = numbers.notna()
+    decimals = cleaned[mask].str.extract(r'\.(\d*)$', expand=False).str.len()
+    decimal_places = int(decimals.max()) if decimals.notna().any() else 0
+    return mask.to_numpy(), numbers[numbers.notna()].astype(float).tolist(), decimal_places
+
+
+def file_sha256(filename, chunk_size=1024 * 1024):
+    sha = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def manifest_path(filename):
+    return f"{filename}.manifest.json"
+
+
+def write_manifest(filename, manifest):
+    """Menulis manifest di samping file; ditulis terakhir sebagai tanda file sudah lengkap"""
+    path = manifest_path(filename)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+
+def save_to_excel_with_number_format(data, filename):
+    """Menyimpan data ke Excel dengan format number yang benar sesuai format asli dari web.
+
+    Kolom numerik dan jumlah desimalnya dideteksi sekali per kolom, lalu baris
+    ditulis lewat workbook write-only dengan satu format number per kolom.
+    File ditulis ke file sementara lalu di-rename, kemudian manifest (jumlah
+    baris/kolom, baris per bagian, SHA-256, schema) ditulis di
+    {filename}.manifest.json. Return manifest tersebut.
+    """
+    if not data:
+        print("❌ Tidak ada data untuk disimpan")
+        return None
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+
+    width = max(len(row) for row in data)
+    columns = [[row[i] if i < len(row) else None for row in data] for i in range(width)]
+    schema = [column_schema(1, 0, len(data), 0)]
+
+    # Mulai dari kolom kedua; kolom pertama adalah nama bagian
+    for col_idx in range(1, width):
+        inferred = infer_column(columns[col_idx])
+        if inferred is None:
+            schema.append(column_schema(col_idx + 1, 0, len(data), 0))
+            continue
+
+        mask, numbers, decimal_places = inferred
+        number_format = number_format_for(decimal_places)
+        schema.append(column_schema(col_idx + 1, int(mask.sum()), len(data), decimal_places))
+        column = columns[col_idx]
+        numbers = iter(numbers)
+        for row_idx in mask.nonzero()[0]:
+            cell = WriteOnlyCell(ws, value=next(numbers))
+            cell.number_format = number_format
+            column[row_idx] = cell
+
+    bagian_rows = {}
+    for row_idx, row in enumerate(data):
+        ws.append([columns[col_idx][row_idx] for col_idx in range(len(row))])
+        bagian_rows[row[0]] = bagian_rows.get(row[0], 0) + 1
+
+    # Simpan ke file sementara di folder yang sama agar rename bersifat atomik
+    tmp_filename = os.path.join(
+        os.path.dirname(filename) or ".", f".{os.path.basename(filename)}.tmp"
+    )
+    wb.save(tmp_filename)
+
+    manifest = {
+        "file": os.path.basename(filename),
+        "rows": len(data),
+        "columns": width,
+        "bagian_rows": bagian_rows,
+        "sha256": file_sha256(tmp_filename),
+        "size_bytes": os.path.getsize(tmp_filename),
+        "schema": schema,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    # Manifest lama dihapus dulu agar file baru tidak pernah dipasangkan dengan manifest lama
+    if os.path.exists(manifest_path(filename)):
+        os.remove(manifest_path(filename))
+    os.replace(tmp_filename, filename)
+    write_manifest(filename, manifest)
+
+    print(f"✅ Data berhasil disimpan dengan format number yang benar: {filename}")
+    return manifest
\ No newline at end of file
@@ -0,0 +1,105 @@
+import hashlib
+import hmac
+import json
+import os
+from datetime import datetime
+
+from lxml import etree
+from lxml import html as lxml_html
+
+from utils.excel import NUMERIC_PATTERN
+from utils.http_fetch import HTTP_TIMEOUT, find_table, is_login_page, parse_report_page
+from utils.page_cache import parse_report_url
+from utils.stream_parse import SessionExpired
+from utils.stub_erp import FIXTURE_DIR, REPORT_PAGE, fixture_path
+
+
+def pseudonym(value, salt):
+    """Nilai pengganti yang stabil: nilai asli yang sama selalu menjadi pengganti yang sama"""
+    return hmac.new(salt, value.encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+def anonymize_value(value, salt):
+    """Teks diganti token, angka diganti angka acak dengan format yang sama (koma, desimal)"""
+    text = value.strip()
+    if not text:
+        return value
+    digest = pseudonym(text, salt)
+    if NUMERIC_PATTERN.match(text.replace(",", "")):
+        digits = iter(str(int(digest, 16)))
+        return "".join(next(digits) if char.isdigit() else char for char in text)
+    return f"X{digest[:max(4, min(len(text), 12))]}"
+
+
+def anonymize_table(table, salt):
+    """Mengganti isi setiap <td> (header <th> dibiarkan) lalu membuang atribut selain class/colspan"""
+    for cell in table.iter("td"):
+        text = " ".join(cell.text_content().split())
+        for child in list(cell):
+            cell.remove(child)
+        cell.text = anonymize_value(text, salt)
+    for element in table.iter():
+        for name in list(element.attrib):
+            if name not in ("class", "colspan", "rowspan"):
+                del element.attrib[name]
+    return table
+
+
+def anonymize_page(content, salt):
+    """Membuat fixture dari halaman laporan: hanya tabel data (sudah dianonimkan) yang disimpan.
+
+    Struktur td.judul > table tetap sama sehingga selector ekstraksi tetap cocok.
+    Return None jika halaman tidak berisi tabel data.
+    """
+    doc = lxml_html.fromstring(content)
+    if is_login_page(doc):
+        raise SessionExpired()
+    _, table = find_table(doc)
+    if table is None:
+        return None
+    if table.tag == "tbody":
+        table = table.getparent()
+
+    rows = [etree.tostring(row, encoding="unicode", method="html").strip()
+            for row in anonymize_table(table, salt).iter("tr")]
+    return REPORT_PAGE.format(rows="\n".join(rows))
+
+
+def record_fixtures(session, report_specs, tanggal, build_urls, salt, folder=FIXTURE_DIR):
+    """Mengambil halaman laporan asli satu tanggal dan menyimpannya sebagai fixture anonim.
+
+    Juga menulis {folder}/index.json berisi daftar fixture dan tanggal rekaman.
+    """
+    salt = salt.encode("utf-8")
+    index = {"recorded_at": datetime.now().isoformat(timespec="seconds"), "date": tanggal,
+             "fixtures": []}
+
+    for name, spec in report_specs.items():
+        urls = build_urls(spec["base_path"], tanggal, spec["bagian"])
+        for bagian, url in urls.items():
+            try:
+                response = session.get(url, timeout=HTTP_TIMEOUT)
+                response.raise_for_status()
+                page = anonymize_page(response.content, salt)
+            except Exception as e:
+                print(f"⚠️ {name} {bagian}: {e}")
+                continue
+            if page is None:
+                print(f"⚠️ {name} {bagian}: tabel tidak ditemukan, dilewati")
+                continue
+
+            report_path, bagian_id, _ = parse_report_url(url)
+            path = fixture_path(report_path, bagian_id, folder)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(page)
+            # Fixture di-parse ulang seperti halaman asli untuk memastikan masih bisa diekstrak
+            rows = len(parse_report_page(page) or [])
+            index["fixtures"].append({"report": name, "bagian": bagian, "path": report_path,
+                                      "b": bagian_id, "rows": rows})
+            print(f"📼 {name} {bagian}: {rows} baris -> {path}")
+
+    os.makedirs(folder, exist_ok=True)
+    with open(os.path.join(folder, "index.json"), "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+    return index
\ No newline at end of file
@@ -0,0 +1,121 @@
+import os
+
+import pandas as pd
+from dotenv import load_dotenv
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow opsional, hanya dibutuhkan untuk history
+    pa = None
+
+load_dotenv()
+HISTORY_DIR = os.getenv("HISTORY_DIR", os.path.join("data", "history"))
+
+
+def require_pyarrow():
+    if pa is None:
+        raise RuntimeError("History membutuhkan pyarrow: pip install pyarrow")
+
+
+def value_columns(width):
+    """Nama kolom nilai: col_1, col_2, ... (kolom pertama hasil scraping adalah bagian)"""
+    return [f"col_{i}" for i in range(1, width)]
+
+
+def rows_to_table(rows):
+    """Mengubah baris [bagian, nilai...] menjadi tabel Arrow bertipe string"""
+    width = max(len(row) for row in rows)
+    names = value_columns(width)
+
+    bagian = []
+    values = [[] for _ in names]
+    for row in rows:
+        bagian.append(row[0])
+        for i in range(len(names)):
+            value = row[i + 1] if i + 1 < len(row) else None
+            values[i].append(None if value is None else str(value))
+
+    # row_no menyimpan urutan asli (urutan bagian) di dalam satu tanggal
+    arrays = [pa.array(bagian, pa.string()), pa.array(range(1, len(rows) + 1), pa.int32())]
+    arrays += [pa.array(column, pa.string()) for column in values]
+    return pa.table(arrays, names=["bagian", "row_no"] + names)
+
+
+def partition_path(report, tanggal, folder=HISTORY_DIR):
+    return os.path.join(folder, f"report={report}", f"date={tanggal}")
+
+
+def append_history(report, tanggal, rows, folder=HISTORY_DIR):
+    """Menyimpan baris satu laporan/tanggal ke partisi report=…/date=….
+
+    Partisi yang sama ditimpa, jadi menjalankan ulang tanggal yang sama tidak
+    menggandakan baris. Return path file Parquet.
+    """
+    require_pyarrow()
+    if not rows:
+        return None
+
+    path = partition_path(report, tanggal, folder)
+    os.makedirs(path, exist_ok=True)
+    filename = os.path.join(path, "part-0.parquet")
+    tmp_filename = f"{filename}.tmp"
+
+    pq.write_table(rows_to_table(rows), tmp_filename, compression="zstd")
+    os.replace(tmp_filename, filename)
+    print(f"🗄️ History {report} {tanggal}: {len(rows)} baris -> {filename}")
+    return filename
+
+
+def to_numeric_columns(df, columns):
+    """Kolom yang semua nilainya angka (koma ribuan diabaikan) diubah ke float"""
+    for column in columns:
+        text = df[column].str.replace(",", "", regex=False)
+        numbers = pd.to_numeric(text, errors="coerce")
+        if numbers.notna().sum() == text.notna().sum() and text.notna().any():
+            df[column] = numbers
+    return df
+
+
+def read_history(report, date_from=None, date_to=None, columns=None, bagian=None,
+                 numeric=True, folder=HISTORY_DIR):
+    """Membaca history satu laporan untuk rentang tanggal.
+
+    Hanya partisi tanggal yang cocok dan kolom yang diminta yang dibaca.
+    Return DataFrame dengan kolom date, bagian, row_no dan kolom nilai.
+    """
+    require_pyarrow()
+    path = os.path.join(folder, f"report={report}")
+    if not os.path.isdir(path):
+        return pd.DataFrame()
+
+    partitioning = ds.partitioning(pa.schema([("date", pa.string())]), flavor="hive")
+    dataset = ds.dataset(path, format="parquet", partitioning=partitioning)
+    # Skema default hanya diambil dari fragment pertama; partisi yang lebih lebar
+    # akan kehilangan kolom col_N tambahannya tanpa skema gabungan
+    schema = pa.unify_schemas(
+        [fragment.physical_schema for fragment in dataset.get_fragments()]
+        + [partitioning.schema]
+    )
+    dataset = ds.dataset(path, format="parquet", partitioning=partitioning, schema=schema)
+
+    condition = None
+    for expression in [
+        ds.field("date") >= date_from if date_from else None,
+        ds.field("date") <= date_to if date_to else None,
+        ds.field("bagian").isin(bagian) if bagian else None,
+    ]:
+        if expression is not None:
+            condition = expression if condition is None else condition & expression
+
+    if columns:
+        columns = ["date", "bagian", "row_no"] + [c for c in columns if c not in ("date", "bagian", "row_no")]
+
+    df = dataset.to_table(columns=columns, filter=condition).to_pandas()
+    df = df[["date"] + [c for c in df.columns if c != "date"]]
+    df = df.sort_values(["date", "row_no"], kind="stable").reset_index(drop=True)
+
+    if numeric:
+        df = to_numeric_columns(df, [c for c in df.columns if c.startswith("col_")])
+    return df
\ No newline at end of file
@@ -0,0 +1,323 @@
+import os
+import time
+from urllib.parse import urljoin
+
+import requests
+from dotenv import load_dotenv
+from lxml import html as lxml_html
+from requests.adapters import HTTPAdapter
+
+from utils.logs import logger
+from utils.session_store import clear_cookies, load_cookies
+from utils.sink import ListSink
+from utils.stream_parse import ErrorPage, SessionExpired, TableNotFound, iter_report_rows
+from utils.telemetry import new_stats
+
+load_dotenv()
+WEB_URL = os.getenv("WEB_URL")
+EMAIL = os.getenv("EMAIL")
+PASSWORD = os.getenv("PASSWORD")
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "30"))
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "10"))
+# Parser streaming untuk mode http (otomatis aktif dengan --stream) dan ukuran potongan respons
+HTTP_STREAM_PARSE = os.getenv("HTTP_STREAM_PARSE", "0") == "1"
+STREAM_CHUNK_SIZE = int(os.getenv("STREAM_CHUNK_SIZE", str(64 * 1024)))
+
+JUDUL_CLASS = "contains(concat(' ', normalize-space(@class), ' '), ' judul ')"
+
+# Padanan selector di extract_table_data. lxml tidak menambahkan <tbody>
+# seperti browser, jadi yang dicari adalah <table>-nya.
+TABLE_XPATHS = [
+    ("td.judul > table > tbody", f"//td[{JUDUL_CLASS}]/table"),
+    (".judul table tbody", f"//*[{JUDUL_CLASS}]//table"),
+    ("table tbody", "//table"),
+]
+
+
+def create_session(pool_size=HTTP_POOL_SIZE):
+    """Session HTTP keep-alive dengan connection pool"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def session_from_driver(driver, pool_size=HTTP_POOL_SIZE):
+    """Membuat session HTTP dari cookie login Selenium"""
+    session = create_session(pool_size)
+    session.headers["User-Agent"] = driver.execute_script("return navigator.userAgent;")
+    for cookie in driver.get_cookies():
+        session.cookies.set(
+            cookie["name"],
+            cookie["value"],
+            domain=cookie.get("domain"),
+            path=cookie.get("path", "/"),
+        )
+    print(f"🍪 {len(driver.get_cookies())} cookie login dipindahkan ke session HTTP")
+    return session
+
+
+def is_login_page(doc):
+    """Halaman login ditandai dengan adanya input password"""
+    return bool(doc.xpath("//input[@name='password']"))
+
+
+def restore_session(session, base_url=None, email=None):
+    """Memasang cookie login tersimpan lalu memeriksanya dengan satu request.
+
+    Return True jika session masih valid; cookie yang sudah tidak berlaku dihapus.
+    """
+    base_url = base_url or WEB_URL
+    cookies = load_cookies(base_url, email or EMAIL)
+    if not cookies:
+        return False
+
+    for cookie in cookies:
+        session.cookies.set(cookie["name"], cookie["value"],
+                            domain=cookie.get("domain"), path=cookie.get("path", "/"))
+    try:
+        response = session.get(base_url, timeout=HTTP_TIMEOUT)
+        response.raise_for_status()
+        valid = not is_login_page(lxml_html.fromstring(response.content))
+    except requests.RequestException as e:
+        print(f"⚠️ Gagal memeriksa session tersimpan: {e}")
+        valid = False
+
+    if not valid:
+        print("🔄 Session tersimpan sudah kedaluwarsa, login ulang...")
+        session.cookies.clear()
+        clear_cookies()
+        return False
+    print("♻️ Memakai session login tersimpan")
+    return True
+
+
+def login_session(session=None, base_url=None, email=None, password=None):
+    """Login lewat form POST tanpa browser"""
+    session = session or create_session()
+    base_url = base_url or WEB_URL
+
+    print("🔐 Login ke sistem (HTTP)...")
+    response = session.get(base_url, timeout=HTTP_TIMEOUT)
+    response.raise_for_status()
+
+    doc = lxml_html.fromstring(response.content)
+    forms = doc.xpath("//form[.//input[@name='password']]")
+    if not forms:
+        raise RuntimeError("Form login tidak ditemukan")
+    form = forms[0]
+
+    # Ikutkan semua input tersembunyi (mis. token CSRF)
+    payload = {
+        field.get("name"): field.get("value", "")
+        for field in form.xpath(".//input[@name]")
+    }
+    payload["email"] = email or EMAIL
+    payload["password"] = password or PASSWORD
+
+    action = urljoin(response.url, form.get("action") or response.url)
+    response = session.post(action, data=payload, timeout=HTTP_TIMEOUT)
+    response.raise_for_status()
+
+    if is_login_page(lxml_html.fromstring(response.content)):
+        raise RuntimeError("Gagal login: masih berada di halaman login")
+
+    print("✅ Login berhasil.")
+    return session
+
+
+def find_table(doc):
+    """Mencari tabel data dengan urutan selector yang sama seperti versi browser"""
+    for selector, xpath in TABLE_XPATHS:
+        tables = doc.xpath(xpath)
+        if tables:
+            # Browser menyisipkan <tbody>, jadi tbody pertama = isi tabel
+            tbodies = tables[0].xpath("./tbody")
+            return selector, (tbodies[0] if tbodies else tables[0])
+    return None, None
+
+
+def cell_text(cell):
+    """Teks sel dengan spasi dirapikan, mendekati WebElement.text"""
+    return " ".join(cell.text_content().split())
+
+
+def parse_table_html(page):
+    """Mengambil baris data dari HTML laporan (tanpa header dan baris total terakhir)"""
+    doc = lxml_html.fromstring(page) if isinstance(page, (str, bytes)) else page
+
+    selector, table = find_table(doc)
+    if table is None:
+        logger.warning("❌ Tidak dapat menemukan tabel dengan selector apapun")
+        return []
+
+    rows = table.xpath(".//tr")
+    logger.debug("✅ Tabel ditemukan dengan selector: %s (%d baris)", selector, len(rows))
+
+    if len(rows) <= 2:
+        logger.info("⚠️ Tabel kosong atau hanya ada header")
+        return []
+
+    data = []
+    for row in rows[1:-1]:
+        cols = row.xpath(".//td")
+        if cols:
+            data.append([cell_text(col) for col in cols])
+    return data
+
+
+def is_error_page(page, doc):
+    """Pemeriksaan error yang sama dengan collect_data versi browser"""
+    title = doc.findtext(".//title") or ""
+    return "error" in page.lower() or "404" in title
+
+
+def fetch_table(session, url, timeout=HTTP_TIMEOUT, stats=None):
+    """Mengambil satu halaman laporan dan mengembalikan baris datanya.
+
+    Return None jika halaman error, [] jika tabel kosong. Jika stats diberikan,
+    waktu request, waktu parsing dan ukuran halaman dicatat di dalamnya.
+    """
+    start = time.perf_counter()
+    response = session.get(url, timeout=timeout)
+    response.raise_for_status()
+    fetched = time.perf_counter()
+    data = parse_report_page(response.content)
+
+    if stats is not None:
+        stats["navigation_s"] = fetched - start
+        stats["extract_s"] = time.perf_counter() - fetched
+        stats["size_bytes"] = len(response.content)
+    return data
+
+
+def parse_report_page(content):
+    """Memeriksa halaman laporan lalu mengambil baris datanya.
+
+    Return None jika halaman error, [] jika tabel kosong.
+    """
+    doc = lxml_html.fromstring(content)
+
+    if is_login_page(doc):
+        raise SessionExpired()
+
+    page = content.decode("utf-8", errors="replace") if isinstance(content, bytes) else content
+    if is_error_page(page, doc):
+        return None
+
+    return parse_table_html(doc)
+
+
+def fetch_table_stream(session, url, timeout=HTTP_TIMEOUT, stats=None):
+    """Generator baris satu halaman laporan; respons dibaca per potongan (stream=True).
+
+    Jika stats diberikan: navigation_s = sampai header diterima, extract_s =
+    unduh + parsing, size_bytes = ukuran halaman.
+    """
+    start = time.perf_counter()
+    response = session.get(url, timeout=timeout, stream=True)
+    try:
+        response.raise_for_status()
+        received = time.perf_counter()
+        size = 0
+
+        def chunks():
+            nonlocal size
+            for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                size += len(chunk)
+                yield chunk
+
+        try:
+            yield from iter_report_rows(chunks())
+        finally:
+            if stats is not None:
+                stats["navigation_s"] = received - start
+                stats["extract_s"] = time.perf_counter() - received
+                stats["size_bytes"] = size
+    finally:
+        response.close()
+
+
+def write_table_stream(sink, bagian, session, url, timeout=HTTP_TIMEOUT, stats=None):
+    """Mengalirkan baris satu halaman langsung ke sink.
+
+    Return jumlah baris, atau None jika halaman error (baris yang sempat
+    ditulis dibatalkan oleh sink). Halaman tanpa tabel .judul diambil ulang
+    dengan parser biasa.
+    """
+    try:
+        return sink.write(bagian, fetch_table_stream(session, url, timeout, stats))
+    except ErrorPage:
+        return None
+    except TableNotFound:
+        logger.info("ℹ️ Tabel .judul tidak ditemukan saat streaming, memakai parser biasa")
+        data = fetch_table(session, url, timeout, stats)
+        return None if data is None else sink.write(bagian, data)
+
+
+def collect_data_http(session, urls_dict, jenis, cache=None, telemetry=None, failed=None,
+                      sink=None, stream_parse=HTTP_STREAM_PARSE):
+    """Versi HTTP dari collect_data: mengambil setiap URL langsung lewat session.
+
+    Dengan sink, baris ditulis per bagian dan yang dikembalikan jumlah baris.
+    Dengan stream_parse, halaman di-parse per potongan dan baris dialirkan ke
+    sink tanpa menahan halaman maupun tabelnya di memori.
+    """
+    failed = failed if failed is not None else {}
+    output = sink if sink is not None else ListSink()
+    total = 0
+
+    logger.info("🚀 Memulai pengumpulan data %s (HTTP%s) dari %d bagian...",
+                jenis, ", streaming" if stream_parse else "", len(urls_dict))
+
+    for i, (bagian, url) in enumerate(urls_dict.items()):
+        logger.info("\n📥 [%d/%d] Mengambil data %s - %s...", i + 1, len(urls_dict), jenis, bagian)
+        logger.debug("🔗 URL: %s", url)
+
+        start = time.perf_counter()
+        data = cache.get(url) if cache else None
+        if data is not None:
+            logger.info("💾 Diambil dari cache")
+            if telemetry:
+                telemetry.record(jenis, bagian, url, "cache", rows=len(data))
+            count = output.write(bagian, data)
+        else:
+            stats = new_stats()
+            try:
+                if stream_parse:
+                    # Baris langsung masuk sink, jadi halaman ini tidak ikut di-cache
+                    count = write_table_stream(output, bagian, session, url, stats=stats)
+                else:
+                    data = fetch_table(session, url, stats=stats)
+                    count = None if data is None else len(data)
+            except requests.RequestException as e:
+                logger.warning("⚠️ Gagal memuat halaman untuk %s: %s", bagian, e)
+                failed[bagian] = str(e)
+                if telemetry:
+                    stats["navigation_s"] = time.perf_counter() - start
+                    telemetry.record_stats(jenis, bagian, url, "failed", stats)
+                continue
+
+            if telemetry:
+                outcome = "error_page" if count is None else "ok" if count else "empty"
+                telemetry.record_stats(jenis, bagian, url, outcome, stats, rows=count or 0)
+            if count is None:
+                logger.warning("⚠️ Halaman error untuk bagian %s", bagian)
+                failed[bagian] = "halaman error"
+                continue
+            if not stream_parse:
+                if cache and data:
+                    cache.put(url, data)
+                output.write(bagian, data)
+
+        total += count
+        if count:
+            logger.info("✅ Berhasil mengambil %d baris dari %s (%.2f detik)",
+                        count, bagian, time.perf_counter() - start)
+        else:
+            logger.info("⚠️ Tidak ada data dari %s", bagian)
+
+    logger.info("\n🎯 Total data terkumpul: %d baris", total)
+    # Tanpa sink: return list semua baris; bagian diambil berurutan sehingga tidak perlu reorder
+    return output.close() if sink is None else total
\ No newline at end of file
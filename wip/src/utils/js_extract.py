@@ -0,0 +1,69 @@
+import time
+
+from utils.logs import logger
+
+# Urutan selector sama dengan extract_table_data
+TABLE_SELECTORS = [
+    "td.judul > table > tbody",
+    "table > tbody",
+    ".judul table tbody",
+    "table tbody",
+]
+
+# Satu execute_script: cari tabel, lalu serialisasi semua baris (termasuk header)
+# menjadi array bersarang. Baris data memakai <td> seperti find_elements(By.TAG_NAME, "td");
+# hanya baris pertama (header) yang memakai <th> jika tidak punya <td>, sehingga
+# subheader/total berisi <th> di tengah tabel tetap kosong dan dilewati seperti versi HTTP.
+EXTRACT_TABLE_SCRIPT = """
+const selectors = arguments[0];
+for (const selector of selectors) {
+    const table = document.querySelector(selector);
+    if (!table) {
+        continue;
+    }
+    const rows = [];
+    for (const row of table.getElementsByTagName('tr')) {
+        let cells = row.getElementsByTagName('td');
+        if (cells.length === 0 && rows.length === 0) {
+            cells = row.getElementsByTagName('th');
+        }
+        rows.push(Array.from(cells, cell => cell.innerText.trim()));
+    }
+    return {selector: selector, rows: rows};
+}
+return null;
+"""
+
+HIGHLIGHT_SCRIPT = """
+const table = document.querySelector(arguments[0]);
+if (!table) {
+    return;
+}
+const rows = Array.from(table.getElementsByTagName('tr')).slice(1, -1);
+for (const row of rows) {
+    row.style.border = arguments[1] ? '2px solid red' : '';
+    row.style.backgroundColor = arguments[1] ? 'yellow' : '';
+}
+"""
+
+
+def extract_table_rows(driver, selectors=TABLE_SELECTORS):
+    """Mengambil seluruh isi tabel dalam satu round-trip WebDriver.
+
+    Return (selector, rows) dengan rows berisi semua baris termasuk header,
+    atau (None, None) jika tidak ada tabel yang cocok.
+    """
+    result = driver.execute_script(EXTRACT_TABLE_SCRIPT, selectors)
+    if not result:
+        return None, None
+    return result["selector"], result["rows"]
+
+
+def highlight_table_rows(driver, selector, duration=1.5):
+    """Highlight baris data tabel lewat selector, tanpa mengambil WebElement per baris"""
+    try:
+        driver.execute_script(HIGHLIGHT_SCRIPT, selector, True)
+        time.sleep(duration)
+        driver.execute_script(HIGHLIGHT_SCRIPT, selector, False)
+    except Exception as e:
+        logger.warning("⚠️ Gagal highlight rows: %s", e)
\ No newline at end of file
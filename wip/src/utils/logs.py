@@ -0,0 +1,25 @@
+import logging
+import os
+import sys
+
+from dotenv import load_dotenv
+
+load_dotenv()
+# Level log untuk pesan per halaman: DEBUG menampilkan URL dan isi setiap baris
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
+logger = logging.getLogger("wip")
+
+
+def setup_logging(debug=False):
+    """Log ke stdout tanpa prefix agar sejajar dengan print; --debug memaksa level DEBUG"""
+    level = logging.DEBUG if debug else getattr(logging, LOG_LEVEL, logging.INFO)
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.handlers[:] = [handler]
+    logger.setLevel(level)
+    logger.propagate = False
+    return logger
+
+
+setup_logging()
\ No newline at end of file
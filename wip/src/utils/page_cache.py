@@ -0,0 +1,147 @@
+import hashlib
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from urllib.parse import parse_qs, urlsplit
+
+from dotenv import load_dotenv
+
+load_dotenv()
+CACHE_DIR = os.getenv("CACHE_DIR", os.path.join("data", "cache"))
+# Umur maksimal (detik) cache untuk tanggal hari ini; tanggal yang sudah lewat tidak kedaluwarsa
+CACHE_TTL_TODAY = int(os.getenv("CACHE_TTL_TODAY", "300"))
+# Batas ukuran cache; entri tertua (mtime) dihapus jika terlampaui
+CACHE_MAX_MB = int(os.getenv("CACHE_MAX_MB", "200"))
+
+
+def page_key(report_path, bagian_id, tanggal):
+    """Kunci cache sha256 dari (path laporan, id bagian, tanggal)"""
+    raw = f"{report_path.strip('/')}|{bagian_id}|{tanggal}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def parse_report_url(url):
+    """Mengambil (path laporan, id bagian, tanggal) dari URL laporan"""
+    parts = urlsplit(url)
+    query = parse_qs(parts.query, keep_blank_values=True)
+    bagian_id = query.get("b", [""])[0]
+    tanggal = query.get("d", [""])[0]
+    return parts.path.strip("/"), bagian_id, tanggal
+
+
+def is_closed_date(tanggal):
+    """Tanggal sebelum hari ini dianggap sudah tutup dan datanya tidak berubah"""
+    return tanggal < datetime.today().strftime("%Y-%m-%d")
+
+
+def fetched_after_close(tanggal, fetched_at):
+    """Halaman baru dianggap final jika diambil setelah tanggalnya berakhir.
+
+    Halaman yang di-cache di tengah hari tetap memakai TTL meskipun tanggalnya
+    sudah lewat, agar data parsial tidak tersimpan selamanya.
+    """
+    try:
+        day_end = datetime.strptime(tanggal, "%Y-%m-%d") + timedelta(days=1)
+    except ValueError:
+        return False
+    return fetched_at >= day_end.timestamp()
+
+
+class PageCache:
+    """Cache di disk untuk baris hasil ekstraksi per halaman laporan"""
+
+    def __init__(self, folder=CACHE_DIR, ttl_today=CACHE_TTL_TODAY, max_mb=CACHE_MAX_MB):
+        self.folder = folder
+        self.ttl_today = ttl_today
+        self.max_bytes = max_mb * 1024 * 1024
+        os.makedirs(folder, exist_ok=True)
+        self.total_bytes = sum(size for _, _, size in self.entries())
+
+    def path_for(self, key):
+        return os.path.join(self.folder, key[:2], f"{key}.json")
+
+    def entries(self):
+        """Semua file cache sebagai (mtime, path, ukuran)"""
+        result = []
+        for sub in os.scandir(self.folder):
+            if not sub.is_dir():
+                continue
+            for entry in os.scandir(sub.path):
+                if entry.name.endswith(".json"):
+                    stat = entry.stat()
+                    result.append((stat.st_mtime, entry.path, stat.st_size))
+        return result
+
+    def remove(self, path):
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+            self.total_bytes -= size
+        except OSError:
+            pass
+
+    def get(self, url):
+        """Baris dari cache untuk URL ini, atau None jika tidak ada/kedaluwarsa"""
+        report_path, bagian_id, tanggal = parse_report_url(url)
+        path = self.path_for(page_key(report_path, bagian_id, tanggal))
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+        closed = is_closed_date(tanggal) and fetched_after_close(tanggal, entry["fetched_at"])
+        if not closed and time.time() - entry["fetched_at"] > self.ttl_today:
+            self.remove(path)
+            return None
+
+        return entry["rows"]
+
+    def put(self, url, rows):
+        """Menyimpan baris satu halaman; ditulis atomik lewat file sementara"""
+        report_path, bagian_id, tanggal = parse_report_url(url)
+        path = self.path_for(page_key(report_path, bagian_id, tanggal))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        entry = {
+            "report": report_path,
+            "bagian_id": bagian_id,
+            "date": tanggal,
+            "fetched_at": time.time(),
+            "rows": rows,
+        }
+        if os.path.exists(path):
+            self.remove(path)
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        self.total_bytes += os.path.getsize(path)
+
+        if self.total_bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """Menghapus entri tertua sampai ukuran cache di bawah batas"""
+        for mtime, path, size in sorted(self.entries()):
+            if self.total_bytes <= self.max_bytes:
+                break
+            self.remove(path)
+
+    def split(self, urls_dict):
+        """Memisahkan bagian yang ada di cache dari yang harus diambil.
+
+        Return (hasil cache {bagian: baris}, urls_dict yang belum ada di cache).
+        """
+        cached = {}
+        missing = {}
+        for bagian, url in urls_dict.items():
+            rows = self.get(url)
+            if rows is None:
+                missing[bagian] = url
+            else:
+                cached[bagian] = rows
+        return cached, missing
\ No newline at end of file
@@ -0,0 +1,174 @@
+import csv
+import hashlib
+import os
+import time
+from datetime import datetime
+
+from dotenv import load_dotenv
+
+from utils.http_fetch import HTTP_TIMEOUT, parse_report_page
+from utils.stream_parse import SessionExpired
+
+load_dotenv()
+# Jarak antar polling (menit) untuk --poll tanpa angka
+POLL_MINUTES = float(os.getenv("POLL_MINUTES", "5"))
+POLL_FOLDER = os.path.join("data", "live")
+
+
+def row_hash(row):
+    text = "\x1f".join("" if value is None else str(value) for value in row)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class PagePoller:
+    """Mengambil ulang halaman laporan dan hanya mengembalikan baris yang baru atau berubah.
+
+    ETag/Last-Modified dari server dipakai untuk request kondisional (304 = tidak
+    berubah). Jika server tidak mengirim validator, hash isi halaman dipakai
+    sehingga halaman yang sama tidak di-parse ulang. Jika session kedaluwarsa,
+    connect() dipanggil untuk membuat session baru lalu halaman diambil ulang sekali.
+    """
+
+    def __init__(self, session, timeout=HTTP_TIMEOUT, connect=None):
+        self.session = session
+        self.timeout = timeout
+        self.connect = connect
+        self.pages = {}
+
+    def fetch(self, url):
+        """Return (status, baris); status: 'not-modified', 'unchanged', 'changed' atau 'error'"""
+        try:
+            return self.fetch_once(url)
+        except SessionExpired:
+            if self.connect is None:
+                raise
+            print("🔄 Session kedaluwarsa, login ulang...")
+            self.session = self.connect()
+            return self.fetch_once(url)
+
+    def fetch_once(self, url):
+        state = self.pages.setdefault(url, {
+            "etag": None,
+            "last_modified": None,
+            "page_hash": None,
+            "row_hashes": [],
+        })
+
+        headers = {}
+        if state["etag"]:
+            headers["If-None-Match"] = state["etag"]
+        if state["last_modified"]:
+            headers["If-Modified-Since"] = state["last_modified"]
+
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304:
+            return "not-modified", []
+        response.raise_for_status()
+
+        state["etag"] = response.headers.get("ETag")
+        state["last_modified"] = response.headers.get("Last-Modified")
+
+        page_hash = hashlib.sha256(response.content).hexdigest()
+        if page_hash == state["page_hash"]:
+            return "unchanged", []
+
+        data = parse_report_page(response.content)
+        if data is None:
+            return "error", []
+        state["page_hash"] = page_hash
+        return "changed", self.diff_rows(state, data)
+
+    def diff_rows(self, state, data):
+        """Membandingkan baris per posisi: (status, baris) untuk baris baru dan berubah"""
+        old_hashes = state["row_hashes"]
+        new_hashes = [row_hash(row) for row in data]
+        known = set(old_hashes)
+
+        changes = []
+        for i, (digest, row) in enumerate(zip(new_hashes, data)):
+            if digest in known:
+                continue
+            changes.append(("berubah" if i < len(old_hashes) else "baru", row))
+
+        state["row_hashes"] = new_hashes
+        return changes
+
+
+def live_header(width):
+    return ["polled_at", "status", "bagian"] + [f"col_{i}" for i in range(1, width + 1)]
+
+
+def append_changes(filename, polled_at, changes):
+    """Menambahkan baris yang berubah ke CSV live (polled_at, status, bagian, nilai...).
+
+    Jika baris baru lebih lebar dari header yang ada, file ditulis ulang dengan
+    header selebar baris terpanjang agar tidak ada nilai tanpa nama kolom.
+    """
+    os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+    width = max(len(row) for _, _, row in changes)
+    new_rows = [[polled_at, status, bagian] + row for status, bagian, row in changes]
+
+    existing = []
+    if os.path.exists(filename):
+        with open(filename, newline="", encoding="utf-8") as f:
+            existing = list(csv.reader(f))
+    header_width = len(existing[0]) - 3 if existing else -1
+
+    if width <= header_width:
+        with open(filename, "a", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerows(new_rows)
+        return
+
+    tmp_filename = f"{filename}.tmp"
+    with open(tmp_filename, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(live_header(width))
+        writer.writerows(existing[1:] + new_rows)
+    os.replace(tmp_filename, filename)
+
+
+def poll_reports(poller, report_specs, build_urls, interval_minutes=POLL_MINUTES,
+                 cycles=None, folder=POLL_FOLDER):
+    """Polling laporan hari ini setiap interval_minutes menit sampai dihentikan (Ctrl+C).
+
+    Baris yang baru atau berubah ditulis ke {folder}/{prefix}-{tanggal}-live.csv.
+    """
+    cycle = 0
+    while cycles is None or cycle < cycles:
+        cycle += 1
+        started = time.perf_counter()
+        tanggal = datetime.today().strftime("%Y-%m-%d")
+        polled_at = datetime.now().isoformat(timespec="seconds")
+        print(f"\n{'=' * 60}")
+        print(f"🔄 Polling #{cycle} {tanggal} {polled_at[11:]}")
+
+        for name, spec in report_specs.items():
+            counts = {"not-modified": 0, "unchanged": 0, "changed": 0, "error": 0}
+            changes = []
+            urls = build_urls(spec["base_path"], tanggal, spec["bagian"])
+
+            for bagian, url in urls.items():
+                try:
+                    status, rows = poller.fetch(url)
+                except Exception as e:
+                    print(f"⚠️ Gagal memuat halaman untuk {bagian}: {e}")
+                    counts["error"] += 1
+                    continue
+                counts[status] += 1
+                changes.extend((change, bagian, row) for change, row in rows)
+
+            if changes:
+                filename = os.path.join(folder, f"{spec['prefix']}-{tanggal}-live.csv")
+                append_changes(filename, polled_at, changes)
+                print(f"✅ {name}: {len(changes)} baris baru/berubah -> {filename}")
+            else:
+                print(f"💤 {name}: tidak ada perubahan")
+            print(f"   halaman: {counts['changed']} berubah, "
+                  f"{counts['unchanged'] + counts['not-modified']} sama "
+                  f"({counts['not-modified']} via 304), {counts['error']} error")
+
+        if cycles is not None and cycle >= cycles:
+            break
+        sleep_seconds = max(0, interval_minutes * 60 - (time.perf_counter() - started))
+        print(f"⏳ Polling berikutnya dalam {sleep_seconds / 60:.1f} menit (Ctrl+C untuk berhenti)")
+        time.sleep(sleep_seconds)
\ No newline at end of file
@@ -0,0 +1,30 @@
+from utils import filling, komponen, loss
+
+# Registry laporan WIP: path laporan, mapping bagian, dan prefix file output
+REPORTS = {
+    "filling": {
+        "jenis": "FILLING TEM",
+        "base_path": "laporan/loss_bagian_cetak",
+        "bagian": filling.BAGIAN_MAPPING,
+        "prefix": "filling",
+    },
+    "loss": {
+        "jenis": "LOSS",
+        "base_path": "laporan/loss_bagian_cetak",
+        "bagian": loss.BAGIAN_MAPPING,
+        "prefix": "loss",
+    },
+    "komponen": {
+        "jenis": "KOMPONEN",
+        "base_path": "laporan/komponen_cetak",
+        "bagian": komponen.BAGIAN_MAPPING,
+        "prefix": "komponen",
+    },
+}
+
+
+def get_report(name):
+    """Mengambil spesifikasi laporan dari registry"""
+    if name not in REPORTS:
+        raise KeyError(f"Laporan tidak dikenal: {name} (pilihan: {', '.join(REPORTS)})")
+    return REPORTS[name]
\ No newline at end of file
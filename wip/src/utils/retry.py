@@ -0,0 +1,119 @@
+import os
+import random
+import time
+
+from dotenv import load_dotenv
+
+from utils.page_cache import parse_report_url
+from utils.sink import ListSink, OrderedSink
+
+load_dotenv()
+# Jumlah putaran ulang untuk bagian yang gagal (0 = tanpa retry)
+RETRY_ATTEMPTS = int(os.getenv("RETRY_ATTEMPTS", "3"))
+# Backoff eksponensial dengan full jitter: acak 0..min(max, base * 2^n) detik
+RETRY_BASE_DELAY = float(os.getenv("RETRY_BASE_DELAY", "1"))
+RETRY_MAX_DELAY = float(os.getenv("RETRY_MAX_DELAY", "30"))
+# Circuit breaker per bagian: terbuka setelah sejumlah kegagalan berturut-turut
+BREAKER_THRESHOLD = int(os.getenv("BREAKER_THRESHOLD", "4"))
+BREAKER_COOLDOWN = float(os.getenv("BREAKER_COOLDOWN", "300"))
+
+
+def backoff_delay(attempt, base=RETRY_BASE_DELAY, cap=RETRY_MAX_DELAY):
+    """Delay sebelum percobaan ke-attempt (mulai 1) dengan full jitter"""
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+def endpoint_key(url):
+    """Endpoint satu bagian: (path laporan, id bagian), tanpa tanggal"""
+    report_path, bagian_id, _ = parse_report_url(url)
+    return report_path, bagian_id
+
+
+class CircuitBreaker:
+    """Circuit breaker per endpoint bagian.
+
+    Setelah threshold kegagalan berturut-turut, endpoint dilewati selama cooldown
+    detik. Setelah itu satu percobaan diizinkan (half-open); berhasil menutup
+    breaker, gagal membukanya lagi.
+    """
+
+    def __init__(self, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = {}
+        self.opened_at = {}
+
+    def allow(self, key):
+        opened_at = self.opened_at.get(key)
+        if opened_at is None:
+            return True
+        return time.monotonic() - opened_at >= self.cooldown
+
+    def success(self, key):
+        self.failures.pop(key, None)
+        self.opened_at.pop(key, None)
+
+    def failure(self, key):
+        self.failures[key] = self.failures.get(key, 0) + 1
+        if self.failures[key] >= self.threshold:
+            if key not in self.opened_at or self.allow(key):
+                print(f"🔌 Circuit breaker terbuka untuk {key[0]} b={key[1]} "
+                      f"({self.failures[key]} kegagalan berturut-turut)")
+            self.opened_at[key] = time.monotonic()
+
+
+def collect_with_retry(collect, urls_dict, breaker, attempts=RETRY_ATTEMPTS,
+                       base_delay=RETRY_BASE_DELAY, max_delay=RETRY_MAX_DELAY, sink=None):
+    """Menjalankan collect lalu mengulang hanya bagian yang gagal.
+
+    collect(urls, failed, sink) harus menulis baris setiap bagian ke sink dan
+    mengisi dict failed dengan bagian yang gagal. Sink dibungkus reorder buffer
+    sehingga baris tetap sesuai urutan bagian walaupun bagian yang diulang
+    selesai belakangan. Return (hasil sink.close(), {bagian: alasan} untuk
+    bagian yang tetap gagal); tanpa sink hasilnya list semua baris.
+    """
+    output = OrderedSink(sink if sink is not None else ListSink(), urls_dict)
+    allowed = {}
+    gaps = {}
+    for bagian, url in urls_dict.items():
+        if breaker.allow(endpoint_key(url)):
+            allowed[bagian] = url
+        else:
+            gaps[bagian] = "circuit breaker terbuka"
+            output.skip(bagian)
+    if gaps:
+        print(f"🔌 {len(gaps)} bagian dilewati (circuit breaker): {', '.join(gaps)}")
+
+    pending = allowed
+    try:
+        for attempt in range(attempts + 1):
+            if not pending:
+                break
+            if attempt > 0:
+                delay = backoff_delay(attempt, base_delay, max_delay)
+                print(f"🔁 Retry {attempt}/{attempts} untuk {len(pending)} bagian "
+                      f"({', '.join(pending)}) dalam {delay:.1f} detik...")
+                time.sleep(delay)
+
+            failed = {}
+            collect(pending, failed, output)
+
+            retry = {}
+            for bagian, url in pending.items():
+                key = endpoint_key(url)
+                if bagian not in failed:
+                    breaker.success(key)
+                    gaps.pop(bagian, None)
+                    continue
+                breaker.failure(key)
+                gaps[bagian] = failed[bagian]
+                if breaker.allow(key) and attempt < attempts:
+                    retry[bagian] = url
+                else:
+                    output.skip(bagian)
+            pending = retry
+    except BaseException:
+        output.abort()
+        raise
+
+    return output.close(), gaps
\ No newline at end of file
@@ -0,0 +1,103 @@
+import base64
+import json
+import os
+import threading
+import time
+
+from dotenv import load_dotenv
+
+try:
+    import win32crypt
+except ImportError:  # pywin32 hanya ada di Windows; di OS lain file dilindungi permission 0600
+    win32crypt = None
+
+load_dotenv()
+# File cookie login yang dipakai ulang antar run (kosong = tidak disimpan)
+SESSION_FILE = os.getenv("SESSION_FILE", os.path.join("data", "session", "cookies.json"))
+# Cookie yang lebih tua dari ini (jam) tidak dicoba lagi dan langsung login ulang
+SESSION_MAX_AGE_HOURS = float(os.getenv("SESSION_MAX_AGE_HOURS", "12"))
+
+
+def protect(data):
+    """Enkripsi dengan DPAPI (akun Windows saat ini) jika tersedia"""
+    if win32crypt is None:
+        return "plain", base64.b64encode(data).decode("ascii")
+    encrypted = win32crypt.CryptProtectData(data, "wip-session", None, None, None, 0)
+    return "dpapi", base64.b64encode(encrypted).decode("ascii")
+
+
+def unprotect(scheme, payload):
+    data = base64.b64decode(payload)
+    if scheme == "plain":
+        return data
+    if scheme == "dpapi" and win32crypt is not None:
+        return win32crypt.CryptUnprotectData(data, None, None, None, 0)[1]
+    raise ValueError(f"Skema cookie tidak didukung: {scheme}")
+
+
+def write_private(path, text):
+    """Menulis file yang hanya bisa dibaca pemiliknya (0600) secara atomik"""
+    folder = os.path.dirname(path) or "."
+    os.makedirs(folder, mode=0o700, exist_ok=True)
+    # Nama sementara unik karena beberapa browser (mode pool) bisa login bersamaan
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def save_cookies(cookies, base_url, email, path=SESSION_FILE):
+    """Menyimpan cookie login (format Selenium: name, value, domain, path)"""
+    if not path:
+        return
+    cookies = [
+        {key: cookie[key] for key in ("name", "value", "domain", "path") if cookie.get(key)}
+        for cookie in cookies
+    ]
+    scheme, payload = protect(json.dumps(cookies).encode("utf-8"))
+    record = {
+        "base_url": base_url,
+        "email": email,
+        "saved_at": time.time(),
+        "scheme": scheme,
+        "cookies": payload,
+    }
+    try:
+        write_private(path, json.dumps(record))
+    except OSError as e:
+        print(f"⚠️ Gagal menyimpan session login: {e}")
+
+
+def load_cookies(base_url, email, path=SESSION_FILE, max_age_hours=SESSION_MAX_AGE_HOURS):
+    """Cookie tersimpan untuk base_url dan email yang sama, None jika tidak ada atau kedaluwarsa"""
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            record = json.load(f)
+        if record.get("base_url") != base_url or record.get("email") != email:
+            return None
+        if time.time() - record.get("saved_at", 0) > max_age_hours * 3600:
+            return None
+        return json.loads(unprotect(record["scheme"], record["cookies"]))
+    except (OSError, ValueError, KeyError) as e:
+        print(f"⚠️ Session login tersimpan tidak bisa dibaca: {e}")
+        return None
+
+
+def clear_cookies(path=SESSION_FILE):
+    if not path:
+        return
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def cookies_from_session(session):
+    """Cookie requests.Session dalam format yang sama dengan driver.get_cookies()"""
+    return [
+        {"name": c.name, "value": c.value, "domain": c.domain, "path": c.path}
+        for c in session.cookies
+    ]
\ No newline at end of file
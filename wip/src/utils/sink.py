@@ -0,0 +1,183 @@
+import csv
+import os
+from datetime import datetime
+
+from utils.excel import cell_decimals, column_schema, file_sha256, manifest_path, write_manifest
+
+
+class ListSink:
+    """Menyimpan semua baris [bagian] + data di memori (dibutuhkan untuk Excel dan history).
+
+    Seperti sink lain, write() menerima list atau generator baris dan
+    mengembalikan jumlah baris; jika generator gagal di tengah jalan, baris
+    bagian tersebut dibatalkan.
+    """
+
+    def __init__(self):
+        self.rows = []
+
+    def write(self, bagian, rows):
+        mark = len(self.rows)
+        try:
+            self.rows.extend([bagian] + row for row in rows)
+        except BaseException:
+            del self.rows[mark:]
+            raise
+        return len(self.rows) - mark
+
+    def close(self):
+        return self.rows
+
+    def abort(self):
+        self.rows = []
+
+
+class CsvSink:
+    """Menulis baris ke CSV begitu setiap bagian selesai, tanpa menahan laporan di memori.
+
+    Baris ditulis ke file sementara di folder yang sama; close() me-rename file
+    lalu menulis manifest seperti versi Excel dan mengembalikan manifest tersebut.
+    Schema kolom (tipe dan format number) dihitung bertahap per sel dengan aturan
+    yang sama seperti infer_column, tanpa menahan kolomnya di memori.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+        self.tmp_filename = os.path.join(
+            os.path.dirname(filename) or ".", f".{os.path.basename(filename)}.tmp"
+        )
+        self.file = open(self.tmp_filename, "w", newline="", encoding="utf-8")
+        self.writer = csv.writer(self.file)
+        self.rows = 0
+        self.columns = 0
+        self.bagian_rows = {}
+        # Per kolom nilai (kolom ke-2 dst): jumlah sel angka dan desimal terbanyak
+        self.numeric_cells = []
+        self.decimal_places = []
+
+    def write(self, bagian, rows):
+        mark = self.file.tell()
+        count = 0
+        columns = self.columns
+        numeric_cells = list(self.numeric_cells)
+        decimal_places = list(self.decimal_places)
+        try:
+            for row in rows:
+                self.writer.writerow([bagian] + row)
+                count += 1
+                columns = max(columns, len(row) + 1)
+                if len(row) > len(numeric_cells):
+                    numeric_cells += [0] * (len(row) - len(numeric_cells))
+                    decimal_places += [0] * (len(row) - len(decimal_places))
+                for i, value in enumerate(row):
+                    decimals = cell_decimals(value)
+                    if decimals is not None:
+                        numeric_cells[i] += 1
+                        decimal_places[i] = max(decimal_places[i], decimals)
+        except BaseException:
+            # Baris bagian yang gagal di tengah jalan dibuang dari file
+            self.file.seek(mark)
+            self.file.truncate()
+            raise
+        self.file.flush()
+        if count:
+            self.rows += count
+            self.columns = columns
+            self.numeric_cells = numeric_cells
+            self.decimal_places = decimal_places
+            self.bagian_rows[bagian] = self.bagian_rows.get(bagian, 0) + count
+        return count
+
+    def close(self):
+        self.file.close()
+        if not self.rows:
+            os.remove(self.tmp_filename)
+            print("❌ Tidak ada data untuk disimpan")
+            return None
+
+        manifest = {
+            "file": os.path.basename(self.filename),
+            "rows": self.rows,
+            "columns": self.columns,
+            "bagian_rows": self.bagian_rows,
+            "sha256": file_sha256(self.tmp_filename),
+            "size_bytes": os.path.getsize(self.tmp_filename),
+            "schema": self.schema(),
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        if os.path.exists(manifest_path(self.filename)):
+            os.remove(manifest_path(self.filename))
+        os.replace(self.tmp_filename, self.filename)
+        write_manifest(self.filename, manifest)
+        print(f"✅ Data berhasil disimpan: {self.filename}")
+        return manifest
+
+    def schema(self):
+        """Schema kolom dengan bentuk yang sama seperti manifest Excel"""
+        schema = [column_schema(1, 0, self.rows, 0)]
+        for i in range(self.columns - 1):
+            numeric = self.numeric_cells[i] if i < len(self.numeric_cells) else 0
+            decimals = self.decimal_places[i] if i < len(self.decimal_places) else 0
+            schema.append(column_schema(i + 2, numeric, self.rows, decimals))
+        return schema
+
+    def abort(self):
+        """Membuang file sementara jika pengambilan gagal di tengah jalan"""
+        self.file.close()
+        if os.path.exists(self.tmp_filename):
+            os.remove(self.tmp_filename)
+
+
+class OrderedSink:
+    """Reorder buffer di depan sink lain agar baris tetap sesuai urutan bagian.
+
+    Bagian yang selesai lebih dulu ditahan sampai semua bagian sebelumnya
+    ditulis atau dilewati (skip), sehingga yang ditahan hanya bagian yang
+    selesai tidak berurutan.
+    """
+
+    def __init__(self, sink, bagian_order):
+        self.sink = sink
+        self.order = list(bagian_order)
+        self.position = 0
+        self.pending = {}
+
+    def write(self, bagian, rows):
+        """Meneruskan atau menahan baris satu bagian.
+
+        Bagian berikutnya dalam urutan diteruskan langsung (generator tetap
+        streaming); bagian lain ditahan sebagai list sampai gilirannya.
+        """
+        if self.position < len(self.order) and self.order[self.position] == bagian:
+            count = self.sink.write(bagian, rows)
+            self.position += 1
+            self.flush()
+            return count
+        rows = list(rows)
+        self.pending[bagian] = rows
+        self.flush()
+        return len(rows)
+
+    def skip(self, bagian):
+        """Bagian yang gagal: jangan ditunggu lagi"""
+        self.pending[bagian] = []
+        self.flush()
+
+    def flush(self):
+        while self.position < len(self.order) and self.order[self.position] in self.pending:
+            bagian = self.order[self.position]
+            self.sink.write(bagian, self.pending.pop(bagian))
+            self.position += 1
+
+    def close(self):
+        """Menulis sisa bagian yang sudah selesai (yang belum selesai dilewati) lalu menutup sink"""
+        for bagian in self.order[self.position:]:
+            if bagian in self.pending:
+                self.sink.write(bagian, self.pending.pop(bagian))
+        self.position = len(self.order)
+        return self.sink.close()
+
+    def abort(self):
+        self.pending = {}
+        self.sink.abort()
\ No newline at end of file
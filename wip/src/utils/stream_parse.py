@@ -0,0 +1,168 @@
+from collections import deque
+
+from lxml import etree
+
+
+class ErrorPage(Exception):
+    """Halaman error terdeteksi saat streaming; baris yang sudah dikirim harus dibatalkan"""
+
+
+class SessionExpired(RuntimeError):
+    """Halaman laporan berisi form login: cookie session sudah tidak berlaku"""
+
+    def __init__(self):
+        super().__init__("Session tidak valid: diarahkan ke halaman login")
+
+
+class TableNotFound(Exception):
+    """Halaman tidak punya tabel di dalam elemen .judul (atau tabelnya tidak bisa di-stream)"""
+
+
+class ReportTableTarget:
+    """Target parser lxml yang mengumpulkan baris tabel data tanpa membangun DOM.
+
+    Tabel data adalah tabel pertama di dalam elemen ber-class judul (padanan
+    selector td.judul > table). Setiap <tr> yang selesai masuk antrean ready;
+    header dibuang dan satu baris selalu ditahan karena baris terakhir (total)
+    baru diketahui di akhir halaman.
+
+    Seperti find_table, jika tabel punya <tbody> hanya baris <tbody> pertama
+    yang dihitung. Baris <thead>/<tfoot> sebelum <tbody> ditahan dulu dan
+    dibuang begitu <tbody> muncul; tanpa <tbody> baris tersebut ikut dihitung.
+    """
+
+    def __init__(self):
+        self.stack = []
+        self.table_depth = None
+        self.found = False
+        self.done = False
+        self.row = None
+        self.cell = None
+        self.header_seen = False
+        self.held = None
+        self.section = None
+        self.pending = []
+        self.outside_rows = False
+        self.mixed = False
+        self.ready = deque()
+        self.title = []
+        self.in_title = False
+        self.login_page = False
+
+    def start(self, tag, attrib):
+        judul = "judul" in (attrib.get("class") or "").split()
+        if tag == "input" and attrib.get("name") == "password":
+            self.login_page = True
+        elif tag == "title":
+            self.in_title = True
+        elif tag == "table" and not self.found and any(j for _, j in self.stack):
+            self.found = True
+            self.table_depth = len(self.stack) + 1
+        elif (len(self.stack) == self.table_depth and not self.done
+              and tag in ("thead", "tbody", "tfoot")):
+            self.start_section(tag)
+        self.stack.append((tag, judul))
+
+        if self.table_depth is None or self.done:
+            return
+        if tag == "tr" and self.row is None:
+            self.row = []
+        elif tag == "td" and self.row is not None and self.cell is None:
+            self.cell = []
+
+    def data(self, text):
+        if self.cell is not None:
+            self.cell.append(text)
+        elif self.in_title:
+            self.title.append(text)
+
+    def end(self, tag):
+        depth = len(self.stack)
+        if self.stack:
+            self.stack.pop()
+        if tag == "title":
+            self.in_title = False
+        if self.table_depth is None or self.done:
+            return
+
+        if tag == "td" and self.cell is not None:
+            self.row.append(" ".join("".join(self.cell).split()))
+            self.cell = None
+        elif tag == "tr" and self.row is not None:
+            self.finish_row(self.row)
+            self.row = None
+        elif tag == self.section and depth == self.table_depth + 1:
+            if tag == "tbody":
+                # Hanya tbody pertama yang dihitung, sama dengan find_table
+                self.done = True
+            self.section = None
+        elif tag == "table" and depth == self.table_depth:
+            for pending in self.pending:
+                self.count_row(pending)
+            self.pending = []
+            self.done = True
+
+    def start_section(self, tag):
+        self.section = tag
+        if tag != "tbody":
+            return
+        if self.outside_rows:
+            # Baris di luar tbody sudah dikirim, padahal find_table hanya membaca tbody
+            self.mixed = True
+        self.pending = []
+
+    def finish_row(self, row):
+        if self.section in ("thead", "tfoot"):
+            self.pending.append(row)
+            return
+        if self.section is None:
+            self.outside_rows = True
+            for pending in self.pending:
+                self.count_row(pending)
+            self.pending = []
+        self.count_row(row)
+
+    def count_row(self, row):
+        if not self.header_seen:
+            self.header_seen = True
+            return
+        # Baris tanpa <td> tetap dihitung agar baris terakhir yang dibuang sama dengan parse_table_html
+        if self.held:
+            self.ready.append(self.held)
+        self.held = row
+
+    def close(self):
+        return None
+
+
+def iter_report_rows(chunks):
+    """Mem-parsing halaman laporan per potongan dan menghasilkan baris begitu <tr> selesai.
+
+    Pemeriksaan halaman sama dengan parse_report_page: SessionExpired untuk
+    halaman login, ErrorPage untuk halaman error (langsung saat terdeteksi),
+    TableNotFound jika tidak ada tabel .judul atau <tbody> baru muncul setelah
+    baris lain terkirim (write_table_stream lalu memakai parser biasa).
+    """
+    target = ReportTableTarget()
+    parser = etree.HTMLParser(target=target)
+    tail = b""
+    for chunk in chunks:
+        # Sama dengan '"error" in page.lower()', termasuk kata yang terpotong di batas chunk
+        if b"error" in (tail + chunk).lower():
+            raise ErrorPage()
+        tail = chunk[-4:]
+        parser.feed(chunk)
+        if target.mixed:
+            raise TableNotFound()
+        while target.ready:
+            yield target.ready.popleft()
+    parser.close()
+
+    if target.login_page:
+        raise SessionExpired()
+    if "404" in "".join(target.title):
+        raise ErrorPage()
+    if not target.found or target.mixed:
+        raise TableNotFound()
+    while target.ready:
+        yield target.ready.popleft()
\ No newline at end of file
@@ -0,0 +1,212 @@
+import hashlib
+import os
+import random
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+FIXTURE_DIR = os.path.join("data", "fixtures")
+
+LOGIN_PAGE = """<html><head><title>Login</title></head><body>
+<form method="post" action="/login">
+<input type="hidden" name="_token" value="{token}">
+<input type="text" name="email"><input type="password" name="password">
+<button type="submit">Login</button>
+</form></body></html>"""
+
+DASHBOARD_PAGE = "<html><head><title>Dashboard</title></head><body>Dashboard</body></html>"
+
+ERROR_PAGE = "<html><head><title>404 Not Found</title></head><body>Error: halaman tidak ditemukan</body></html>"
+
+REPORT_PAGE = """<html><head><title>Laporan</title></head><body>
+<table><tr><td class="judul"><table>
+{rows}
+</table></td></tr></table></body></html>"""
+
+
+def fixture_path(report_path, bagian_id, folder=FIXTURE_DIR):
+    """File fixture untuk satu bagian: {folder}/{path laporan}/{id bagian}.html"""
+    return os.path.join(folder, *report_path.strip("/").split("/"), f"{bagian_id}.html")
+
+
+def synthetic_page(bagian_id, tanggal, rows, thead=False):
+    """Halaman laporan buatan dengan header, baris data, dan baris total.
+
+    Dengan thead, header ada di <thead> dan data di <tbody>; baris pertama
+    <tbody> adalah subheader seperti yang dibaca find_table.
+    """
+    rng = random.Random(f"{bagian_id}|{tanggal}")
+    header = "<tr><th>No</th><th>Kode</th><th>Nama</th><th>Berat</th><th>Qty</th></tr>"
+    subheader = "<tr><td>#</td><td>Kode</td><td>Nama</td><td>Berat</td><td>Qty</td></tr>"
+    lines = [subheader if thead else header]
+    for i in range(1, rows + 1):
+        lines.append(
+            f"<tr><td>{i}</td><td>K{bagian_id}-{i:04d}</td><td>Item {rng.randint(1, 999)}</td>"
+            f"<td>{rng.uniform(0, 5000):,.2f}</td><td>{rng.randint(1, 300)}</td></tr>"
+        )
+    lines.append(f"<tr><td colspan=\"3\">TOTAL</td><td>0</td><td>{rows}</td></tr>")
+    if thead:
+        lines = [f"<thead>{header}</thead>", "<tbody>"] + lines + ["</tbody>"]
+    return REPORT_PAGE.format(rows="\n".join(lines))
+
+
+class StubERP:
+    """Pengganti lokal ERP: form login, cookie session, dan halaman laporan/...?d=&b=&m=all.
+
+    Halaman laporan diambil dari fixture hasil recorder; bagian tanpa fixture
+    dibuat sintetis (synthetic_rows baris) atau dijawab halaman error jika 0.
+    Latensi dan error dapat diatur untuk benchmark dan uji ketahanan.
+    """
+
+    def __init__(self, email="admin@example.com", password="admin", folder=FIXTURE_DIR,
+                 latency=0.0, jitter=0.0, error_rate=0.0, error_page_rate=0.0,
+                 synthetic_rows=50, thead=False, seed=None):
+        self.email = email
+        self.password = password
+        self.folder = folder
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_page_rate = error_page_rate
+        self.synthetic_rows = synthetic_rows
+        self.thead = thead
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.csrf_token = secrets.token_hex(16)
+        self.sessions = set()
+        self.pages = {}
+        self.counts = {"login": 0, "report": 0, "error": 0, "error_page": 0, "not_modified": 0}
+
+    def count(self, key):
+        with self.lock:
+            self.counts[key] += 1
+
+    def chance(self, rate):
+        with self.lock:
+            return rate > 0 and self.random.random() < rate
+
+    def delay(self):
+        with self.lock:
+            seconds = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0)
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def login(self, form):
+        if form.get("_token") != self.csrf_token:
+            return None
+        if form.get("email") != self.email or form.get("password") != self.password:
+            return None
+        session_id = secrets.token_hex(16)
+        with self.lock:
+            self.sessions.add(session_id)
+        self.count("login")
+        return session_id
+
+    def is_logged_in(self, cookie_header):
+        for part in (cookie_header or "").split(";"):
+            name, _, value = part.strip().partition("=")
+            if name == "stub_session" and value in self.sessions:
+                return True
+        return False
+
+    def report_page(self, report_path, bagian_id, tanggal):
+        """Isi halaman laporan sebagai bytes, None jika tidak ada fixture maupun data sintetis"""
+        key = (report_path, bagian_id, tanggal)
+        if key in self.pages:
+            return self.pages[key]
+
+        path = fixture_path(report_path, bagian_id, self.folder)
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                page = f.read()
+        elif self.synthetic_rows > 0:
+            page = synthetic_page(bagian_id, tanggal, self.synthetic_rows,
+                                  self.thead).encode("utf-8")
+        else:
+            page = None
+        with self.lock:
+            self.pages[key] = page
+        return page
+
+    def handler(self):
+        erp = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def send(self, status, body=b"", headers=None):
+                body = body.encode("utf-8") if isinstance(body, str) else body
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                logged_in = erp.is_logged_in(self.headers.get("Cookie"))
+                if url.path in ("/", "/login"):
+                    # Seperti ERP asli: user yang sudah login diarahkan ke dashboard
+                    if logged_in:
+                        return self.send(302, headers={"Location": "/dashboard"})
+                    return self.send(200, LOGIN_PAGE.format(token=erp.csrf_token))
+                if not logged_in:
+                    return self.send(302, headers={"Location": "/"})
+                if url.path == "/dashboard":
+                    return self.send(200, DASHBOARD_PAGE)
+
+                query = parse_qs(url.query)
+                erp.delay()
+                if erp.chance(erp.error_rate):
+                    erp.count("error")
+                    return self.send(500, "Internal Server Error")
+                if erp.chance(erp.error_page_rate):
+                    erp.count("error_page")
+                    return self.send(200, ERROR_PAGE)
+
+                page = erp.report_page(url.path, query.get("b", [""])[0], query.get("d", [""])[0])
+                if page is None:
+                    erp.count("error_page")
+                    return self.send(404, ERROR_PAGE)
+
+                etag = '"' + hashlib.sha256(page).hexdigest()[:16] + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    erp.count("not_modified")
+                    return self.send(304, headers={"ETag": etag})
+                erp.count("report")
+                self.send(200, page, {"ETag": etag})
+
+            def do_POST(self):
+                if urlparse(self.path).path != "/login":
+                    return self.send(404, ERROR_PAGE)
+                length = int(self.headers.get("Content-Length") or 0)
+                form = {k: v[0] for k, v in parse_qs(self.rfile.read(length).decode("utf-8")).items()}
+                session_id = erp.login(form)
+                if session_id is None:
+                    return self.send(200, LOGIN_PAGE.format(token=erp.csrf_token))
+                self.send(302, headers={
+                    "Location": "/dashboard",
+                    "Set-Cookie": f"stub_session={session_id}; Path=/; HttpOnly",
+                })
+
+        return Handler
+
+    def serve(self, host="127.0.0.1", port=8765):
+        """Menjalankan server sampai dihentikan (Ctrl+C)"""
+        server = ThreadingHTTPServer((host, port), self.handler())
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+
+    def start(self, host="127.0.0.1", port=0):
+        """Menjalankan server di thread latar; return (server, base URL). Port 0 = port bebas"""
+        server = ThreadingHTTPServer((host, port), self.handler())
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server, f"http://{host}:{server.server_address[1]}"
\ No newline at end of file
@@ -0,0 +1,128 @@
+import os
+import time
+from collections import deque
+
+from dotenv import load_dotenv
+
+from utils.logs import logger
+from utils.waits import PAGE_TIMEOUT, POLL_INTERVAL, ROW_STABLE_INTERVAL
+
+load_dotenv()
+# Jumlah tab yang memuat halaman bersamaan
+TAB_POOL_SIZE = int(os.getenv("TAB_POOL_SIZE", "3"))
+
+# Penanda di dokumen lama, supaya tab yang belum berpindah halaman tidak dianggap siap
+MARK_SCRIPT = "window.__tabPoolStale = true; window.location.href = arguments[0];"
+
+# Satu round-trip: [state, jumlah baris tbody] atau null jika dokumen lama masih tampil
+PROBE_SCRIPT = """
+if (window.__tabPoolStale) {
+    return null;
+}
+const hasTable = document.querySelector('tbody') !== null;
+return [document.readyState, hasTable, document.querySelectorAll('tbody tr').length];
+"""
+
+
+class TabPool:
+    """Sejumlah tab tetap yang dipakai ulang untuk memuat halaman secara paralel"""
+
+    def __init__(self, driver, size=TAB_POOL_SIZE, timeout=PAGE_TIMEOUT,
+                 stable_interval=ROW_STABLE_INTERVAL):
+        self.driver = driver
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.stable_interval = stable_interval
+        self.original_tab = driver.current_window_handle
+        self.handles = [self.original_tab]
+
+    def open(self, count):
+        """Membuka tab tambahan sampai jumlahnya min(size, count)"""
+        while len(self.handles) < min(self.size, count):
+            self.driver.switch_to.new_window("tab")
+            self.handles.append(self.driver.current_window_handle)
+
+    def close(self):
+        """Menutup semua tab tambahan dan kembali ke tab awal"""
+        for handle in self.handles[1:]:
+            try:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            except Exception as e:
+                logger.warning("⚠️ Gagal menutup tab: %s", e)
+        self.handles = [self.original_tab]
+        self.driver.switch_to.window(self.original_tab)
+
+    def navigate(self, handle, url):
+        """Mulai navigasi tanpa menunggu halaman selesai dimuat"""
+        self.driver.switch_to.window(handle)
+        self.driver.execute_script(MARK_SCRIPT, url)
+
+    def probe(self, state):
+        """Memeriksa kesiapan satu tab; return True jika tabel stabil atau halaman selesai tanpa tabel"""
+        try:
+            result = self.driver.execute_script(PROBE_SCRIPT)
+        except Exception:
+            # Dokumen sedang berganti di tengah eksekusi script
+            return False
+        now = time.perf_counter()
+        if result is None:
+            return False
+        if state["navigated"] is None:
+            state["navigated"] = now - state["started"]
+
+        ready_state, has_table, row_count = result
+        if not has_table:
+            return ready_state == "complete"
+
+        if row_count != state["row_count"]:
+            state["row_count"] = row_count
+            state["stable_since"] = now
+            return False
+        return now - state["stable_since"] >= self.stable_interval
+
+    def run(self, tasks):
+        """Memuat semua task (key, url) memakai tab pool.
+
+        Generator ini yield (key, url, siap, lama menunggu, jumlah baris, lama navigasi)
+        ketika sebuah tab selesai, dengan driver sedang berada di tab tersebut.
+        Lama navigasi adalah waktu sampai dokumen baru tampil, sisanya menunggu tabel.
+        Tab dipakai ulang untuk task berikutnya setelah pemanggil selesai memprosesnya.
+        """
+        pending = deque(tasks)
+        self.open(len(pending))
+        active = {}
+
+        def start(handle):
+            key, url = pending.popleft()
+            self.navigate(handle, url)
+            active[handle] = {
+                "key": key,
+                "url": url,
+                "started": time.perf_counter(),
+                "navigated": None,
+                "row_count": None,
+                "stable_since": time.perf_counter(),
+            }
+
+        for handle in self.handles:
+            if pending:
+                start(handle)
+
+        while active:
+            for handle in list(active):
+                state = active[handle]
+                self.driver.switch_to.window(handle)
+                ready = self.probe(state)
+                waited = time.perf_counter() - state["started"]
+
+                if ready or waited >= self.timeout:
+                    navigated = state["navigated"] if state["navigated"] is not None else waited
+                    yield (state["key"], state["url"], ready, waited, state["row_count"] or 0,
+                           navigated)
+                    del active[handle]
+                    if pending:
+                        start(handle)
+
+            if active:
+                time.sleep(POLL_INTERVAL)
\ No newline at end of file
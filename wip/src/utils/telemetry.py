@@ -0,0 +1,185 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+TELEMETRY_FOLDER = os.path.join("data", "telemetry")
+PROM_FILENAME = "wip_scrape.prom"
+PHASES = ["navigation", "wait", "extract", "total"]
+QUANTILES = [0.5, 0.95]
+
+
+def quantile(values, q):
+    """Quantile dengan interpolasi linear (sama seperti numpy default)"""
+    if not values:
+        return 0.0
+    values = sorted(values)
+    position = (len(values) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def prom_labels(**labels):
+    parts = []
+    for key, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"')
+        parts.append(f'{key}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def new_stats():
+    """Dict waktu dan ukuran satu halaman, diisi oleh fungsi fetch"""
+    return {"navigation_s": 0.0, "wait_s": 0.0, "extract_s": 0.0, "size_bytes": 0}
+
+
+def outcome_for(data, ready=True):
+    """Outcome dari hasil fetch: None = halaman error, [] = tabel kosong"""
+    if data is None:
+        return "error_page"
+    if not ready:
+        return "timeout"
+    return "ok" if data else "empty"
+
+
+class Telemetry:
+    """Mencatat waktu, jumlah baris, ukuran dan hasil setiap URL dalam satu run.
+
+    Outcome: ok, empty, error_page, timeout, failed atau cache (tidak diambil dari web).
+    """
+
+    def __init__(self, mode, folder=TELEMETRY_FOLDER):
+        self.mode = mode
+        self.folder = folder
+        self.run_id = datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.records = []
+        self.lock = threading.Lock()
+
+    def record(self, report, bagian, url, outcome, rows=0, navigation_s=0.0, wait_s=0.0,
+               extract_s=0.0, size_bytes=0):
+        entry = {
+            "run_id": self.run_id,
+            "mode": self.mode,
+            "report": report,
+            "bagian": bagian,
+            "url": url,
+            "outcome": outcome,
+            "rows": rows,
+            "bytes": size_bytes,
+            "navigation_s": round(navigation_s, 4),
+            "wait_s": round(wait_s, 4),
+            "extract_s": round(extract_s, 4),
+            "total_s": round(navigation_s + wait_s + extract_s, 4),
+            "at": datetime.now().isoformat(timespec="milliseconds"),
+        }
+        with self.lock:
+            self.records.append(entry)
+
+    def record_stats(self, report, bagian, url, outcome, stats, rows=0):
+        """record() dengan waktu dan ukuran dari dict stats hasil fetch"""
+        self.record(report, bagian, url, outcome, rows=rows, **stats)
+
+    def fetched(self):
+        return [r for r in self.records if r["outcome"] != "cache"]
+
+    def prometheus_text(self):
+        """Metric format teks Prometheus dengan ringkasan p50/p95 per laporan"""
+        lines = [
+            "# HELP wip_page_seconds Waktu per halaman laporan per fase.",
+            "# TYPE wip_page_seconds summary",
+        ]
+        fetched = self.fetched()
+        reports = sorted({r["report"] for r in self.records})
+
+        for report in reports:
+            records = [r for r in fetched if r["report"] == report]
+            for phase in PHASES:
+                values = [r[f"{phase}_s"] for r in records]
+                for q in QUANTILES:
+                    labels = prom_labels(report=report, phase=phase, quantile=q)
+                    lines.append(f"wip_page_seconds{labels} {quantile(values, q):.4f}")
+                labels = prom_labels(report=report, phase=phase)
+                lines.append(f"wip_page_seconds_sum{labels} {sum(values):.4f}")
+                lines.append(f"wip_page_seconds_count{labels} {len(values)}")
+
+        lines += [
+            "# HELP wip_bagian_seconds Total waktu halaman per bagian pada run terakhir.",
+            "# TYPE wip_bagian_seconds gauge",
+        ]
+        # Dijumlahkan per (laporan, bagian): backfill dan retry mengambil bagian yang sama
+        # lebih dari sekali, dan label yang sama tidak boleh muncul dua kali
+        bagian_seconds = {}
+        for r in fetched:
+            key = (r["report"], r["bagian"])
+            bagian_seconds[key] = bagian_seconds.get(key, 0.0) + r["total_s"]
+        for (report, bagian), seconds in bagian_seconds.items():
+            lines.append(f"wip_bagian_seconds{prom_labels(report=report, bagian=bagian)} {seconds:.4f}")
+
+        lines += [
+            "# HELP wip_pages_total Jumlah halaman per hasil.",
+            "# TYPE wip_pages_total counter",
+        ]
+        for report in reports:
+            outcomes = {}
+            for r in self.records:
+                if r["report"] == report:
+                    outcomes[r["outcome"]] = outcomes.get(r["outcome"], 0) + 1
+            for outcome, count in sorted(outcomes.items()):
+                lines.append(f"wip_pages_total{prom_labels(report=report, outcome=outcome)} {count}")
+
+        for metric, field, help_text in [
+            ("wip_rows_total", "rows", "Jumlah baris yang diambil."),
+            ("wip_bytes_total", "bytes", "Ukuran halaman yang diambil (bytes)."),
+        ]:
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+            for report in reports:
+                total = sum(r[field] for r in self.records if r["report"] == report)
+                lines.append(f"{metric}{prom_labels(report=report)} {total}")
+
+        lines += [
+            "# HELP wip_run_timestamp_seconds Waktu run terakhir selesai.",
+            "# TYPE wip_run_timestamp_seconds gauge",
+            f"wip_run_timestamp_seconds{prom_labels(mode=self.mode)} {time.time():.0f}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def write(self):
+        """Menulis JSON lines per run dan file Prometheus (ditimpa setiap run)"""
+        if not self.records:
+            return None, None
+        os.makedirs(self.folder, exist_ok=True)
+
+        jsonl_path = os.path.join(self.folder, f"telemetry-{self.run_id}.jsonl")
+        with open(jsonl_path, "w", encoding="utf-8") as f:
+            for r in self.records:
+                f.write(json.dumps(r, ensure_ascii=False) + "\n")
+
+        prom_path = os.path.join(self.folder, PROM_FILENAME)
+        tmp_path = f"{prom_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp_path, prom_path)
+        return jsonl_path, prom_path
+
+    def print_summary(self, slowest=5):
+        fetched = self.fetched()
+        if not fetched:
+            return
+        print(f"\n⏱️ Telemetry ({len(fetched)} halaman diambil dari web):")
+        for report in sorted({r["report"] for r in fetched}):
+            totals = [r["total_s"] for r in fetched if r["report"] == report]
+            print(f"  {report:<12} p50 {quantile(totals, 0.5):.2f} detik  "
+                  f"p95 {quantile(totals, 0.95):.2f} detik  ({len(totals)} halaman)")
+        print("🐢 Bagian paling lambat:")
+        for r in sorted(fetched, key=lambda r: r["total_s"], reverse=True)[:slowest]:
+            print(f"  {r['report']:<12} {r['bagian']:<16} {r['total_s']:.2f} detik "
+                  f"(nav {r['navigation_s']:.2f}, wait {r['wait_s']:.2f}, "
+                  f"extract {r['extract_s']:.2f}) {r['outcome']}")
+
+    def finish(self):
+        """Menulis file telemetry dan mencetak ringkasan di akhir run"""
+        jsonl_path, prom_path = self.write()
+        self.print_summary()
+        if jsonl_path:
+            print(f"📈 Telemetry: {jsonl_path}, {prom_path}")
\ No newline at end of file
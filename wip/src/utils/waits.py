@@ -0,0 +1,86 @@
+import os
+import time
+
+from dotenv import load_dotenv
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+load_dotenv()
+# Batas waktu (detik) untuk setiap kondisi tunggu
+LOGIN_TIMEOUT = float(os.getenv("LOGIN_TIMEOUT", "15"))
+PAGE_TIMEOUT = float(os.getenv("PAGE_TIMEOUT", "30"))
+# Jumlah baris dianggap stabil jika tidak berubah selama interval ini
+ROW_STABLE_INTERVAL = float(os.getenv("ROW_STABLE_INTERVAL", "0.3"))
+POLL_INTERVAL = 0.1
+
+COUNT_ROWS_SCRIPT = "return document.querySelectorAll('tbody tr').length;"
+
+
+def wait_for_login_form(driver, timeout=LOGIN_TIMEOUT):
+    """Menunggu field email pada form login muncul, return lama menunggu (detik)"""
+    start = time.perf_counter()
+    WebDriverWait(driver, timeout, POLL_INTERVAL).until(
+        EC.presence_of_element_located((By.NAME, "email"))
+    )
+    return time.perf_counter() - start
+
+
+def wait_for_login_redirect(driver, login_url, timeout=LOGIN_TIMEOUT):
+    """Menunggu redirect setelah submit login selesai, return lama menunggu (detik)"""
+
+    def redirected(d):
+        if d.execute_script("return document.readyState;") != "complete":
+            return False
+        # Form login sudah hilang atau URL sudah berpindah
+        return not d.find_elements(By.NAME, "password") or d.current_url != login_url
+
+    start = time.perf_counter()
+    WebDriverWait(driver, timeout, POLL_INTERVAL).until(redirected)
+    return time.perf_counter() - start
+
+
+def table_row_count(driver):
+    """Jumlah baris tbody saat ini, None jika halaman belum punya tbody"""
+    if not driver.find_elements(By.CSS_SELECTOR, "tbody"):
+        return None
+    return driver.execute_script(COUNT_ROWS_SCRIPT)
+
+
+def wait_for_table(driver, timeout=PAGE_TIMEOUT, stable_interval=ROW_STABLE_INTERVAL):
+    """Menunggu tabel laporan siap: tbody ada dan jumlah baris berhenti berubah.
+
+    Return (siap, lama menunggu dalam detik, jumlah baris). Halaman yang selesai
+    dimuat tanpa tbody (mis. halaman error) tidak ditunggu sampai timeout.
+    """
+    start = time.perf_counter()
+
+    def table_or_loaded(d):
+        if d.find_elements(By.CSS_SELECTOR, "tbody"):
+            return "table"
+        if d.execute_script("return document.readyState;") == "complete":
+            return "loaded"
+        return False
+
+    try:
+        state = WebDriverWait(driver, timeout, POLL_INTERVAL).until(table_or_loaded)
+    except TimeoutException:
+        return False, time.perf_counter() - start, 0
+
+    if state != "table":
+        return False, time.perf_counter() - start, 0
+
+    # Tunggu sampai jumlah baris tidak berubah selama stable_interval
+    last_count = driver.execute_script(COUNT_ROWS_SCRIPT)
+    stable_since = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        time.sleep(POLL_INTERVAL)
+        count = driver.execute_script(COUNT_ROWS_SCRIPT)
+        if count != last_count:
+            last_count = count
+            stable_since = time.perf_counter()
+        elif time.perf_counter() - stable_since >= stable_interval:
+            return True, time.perf_counter() - start, count
+
+    return False, time.perf_counter() - start, last_count
\ No newline at end of file